@@ -0,0 +1,67 @@
+"""
+Throughput and memory of bulk import compared with per-row form save, SQLite in memory
+
+    python benchmarks/bulk_import.py 1000000
+"""
+import os
+import sys
+import time
+import resource
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.importer import BulkImporter, CsvSource  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+
+class JobImportForm(forms.Form):
+    project_id = forms.IntegerField(required=True)
+    name = forms.TextField(required=True, max_length=100)
+    hours = forms.IntegerField()
+
+
+def iter_csv(project, rows, invalid_every=100):
+    """ Lines of csv generated on the fly so source does not hold rows in memory """
+    yield 'project_id,name,hours\n'
+
+    for i in range(rows):
+        hours = 'n/a' if i % invalid_every == 0 else str(i % 40)
+        yield '%d,Job %d,%s\n' % (project.pk, i, hours)
+
+
+def per_row(project, rows):
+    for record in CsvSource(iter_csv(project, rows)):
+        form = JobImportForm(instance=Job())
+        form.load_json(record)
+
+        if form.is_valid():
+            form.save()
+
+
+def bulk(project, rows):
+    return BulkImporter(JobImportForm, Job, chunk_size=2000).run(CsvSource(iter_csv(project, rows)))
+
+
+def measure(name, func, rows):
+    project = Project.objects.create(name=name)
+
+    start = time.perf_counter()
+    func(project, rows)
+    elapsed = time.perf_counter() - start
+
+    print('%-8s %9d rows %8.2f s %10.0f rows/s  maxrss %d MiB' % (
+        name, rows, elapsed, rows / elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024))
+
+
+def main(rows=1000000):
+    # per-row save is measured on smaller sample, it is orders of magnitude slower
+    measure('per-row', per_row, min(rows, 10000))
+    measure('bulk', bulk, rows)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
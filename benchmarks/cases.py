@@ -0,0 +1,397 @@
+"""
+Benchmark cases of form lifecycle hot paths. Every case prepares data
+and returns callable which is timed by runner
+"""
+import io
+import json
+
+from .env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms import state  # noqa: E402
+from forms.html import HtmlHelper  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+from .models import Project, Profile, Job, Tag  # noqa: E402
+from .state_token import make_state  # noqa: E402
+
+CASES = []
+
+
+class Case(object):
+    def __init__(self, name, func, number, repeat, queries, memory=False, size=False):
+        self.name = name
+        self.func = func
+        self.number = number
+        self.repeat = repeat
+        self.queries = queries
+        self.memory = memory
+        self.size = size
+
+
+def case(number=1, repeat=5, queries=False, memory=False, size=False):
+    """
+    Register benchmark case. queries=True counts SQL queries of one call,
+    memory=True records peak allocated memory of one call,
+    size=True records utf-8 size of string returned by one call
+    """
+
+    def decorator(func):
+        CASES.append(Case(func.__name__, func, number, repeat, queries, memory, size))
+        return func
+
+    return decorator
+
+
+class FlatForm(forms.Form):
+    name = forms.TextField(required=True, max_length=100)
+    title = forms.Field()
+    email = forms.Field()
+    phone = forms.Field()
+    age = forms.IntegerField()
+    city = forms.Field()
+    country = forms.SelectField(options=[(i, 'Country %d' % i) for i in range(50)])
+    about = forms.TextAreaField()
+    active = forms.CheckBoxField()
+    note = forms.Field()
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.TextField(required=True, max_length=100)
+    hours = forms.IntegerField()
+
+
+class ProfileForm(forms.Form):
+    title = forms.Field()
+
+
+class ProjectForm(forms.Form):
+    name = forms.TextField(required=True)
+    description = forms.TextAreaField()
+    profile = forms.NestedFormField(form_class=ProfileForm)
+    tags = forms.ManyToManyCheckBoxListField(options=True)
+    jobs = forms.FormsetField(form_class=JobForm)
+
+
+class BatchProjectForm(ProjectForm):
+    batch_save = True
+
+
+class ProjectTableForm(ProjectForm):
+    jobs = forms.TableFormsetField(form_class=JobForm)
+
+
+class ProjectHeaderTableForm(ProjectForm):
+    jobs = forms.TableFormsetField(form_class=JobForm, header=True)
+
+
+_projects = dict()
+
+
+def make_project(rows):
+    """ Project with `rows` jobs, profile and tags, created once per size """
+    if rows not in _projects:
+        if not Tag.objects.exists():
+            Tag.objects.bulk_create([Tag(name='tag %d' % i) for i in range(10)])
+
+        project = Project.objects.create(name='Project %d' % rows, description='Description')
+        Profile.objects.create(project=project, title='Profile')
+        project.tags.set(Tag.objects.all()[:3])
+        Job.objects.bulk_create([Job(project=project, name='Job %d' % i, hours=i % 40) for i in range(rows)])
+
+        _projects[rows] = project
+
+    return Project.objects.get(pk=_projects[rows].pk)
+
+
+def make_post(rows, project=None, invalid_every=0):
+    data = {'name': 'Project', 'description': 'Description', '-title': 'Profile'}
+    ids = list(project.jobs.order_by('pk').values_list('pk', flat=True)) if project is not None else []
+
+    for i in range(rows):
+        prefix = 'jobs-%d-' % i
+        data[prefix + 'id'] = str(ids[i]) if i < len(ids) else ''
+        data[prefix + 'name'] = 'Job %d' % i
+        data[prefix + 'hours'] = str(i % 40)
+
+        if invalid_every and i % invalid_every == 0:
+            data[prefix + 'name'] = ''
+            data[prefix + 'hours'] = 'many'
+
+    return data
+
+
+@case(number=100)
+def form_init_flat():
+    return lambda: FlatForm(instance=DynamicObject())
+
+
+@case(number=100)
+def form_rebind_flat():
+    form = FlatForm(instance=DynamicObject())
+    data = {'name': 'Name', 'age': '10', 'country': '3'}
+    return lambda: form.rebind(DynamicObject(), data).is_valid()
+
+
+@case(number=1, queries=True)
+def form_init_formset_200():
+    pk = make_project(200).pk
+    return lambda: ProjectForm(instance=Project.objects.get(pk=pk))
+
+
+@case(number=1)
+def formset_load_1000():
+    data = make_post(1000)
+    return lambda: ProjectForm(instance=Project()).load(data)
+
+
+def make_json(rows):
+    return {
+        'name': 'Project', 'description': 'Description', 'profile': {'title': 'Profile'}, 'tags': [],
+        'jobs': [{'name': 'Job %d' % i, 'hours': i % 40} for i in range(rows)],
+    }
+
+
+@case(number=1)
+def load_flat_nested_500():
+    data = make_post(500)
+    return lambda: ProjectForm(instance=Project()).load(data)
+
+
+@case(number=1)
+def load_json_nested_500():
+    data = make_json(500)
+    return lambda: ProjectForm(instance=Project()).load_json(data)
+
+
+@case(number=1)
+def to_dict_nested_200():
+    form = ProjectForm(instance=make_project(200))
+    return lambda: json.dumps(form.to_dict())
+
+
+@case(number=1000)
+def html_tag():
+    attributes = {'class': 'form-control', 'id': 'name', 'name': 'name', 'value': 'Some <value>', 'required': True}
+    return lambda: HtmlHelper.tag('input', None, attributes)
+
+
+@case(number=100)
+def html_select_200():
+    options = [(i, 'Option %d' % i) for i in range(200)]
+    return lambda: HtmlHelper.select('select', 100, options, {'class': 'form-control'})
+
+
+@case(number=100)
+def render_flat():
+    form = FlatForm(instance=DynamicObject())
+    return lambda: form.render()
+
+
+@case(number=1)
+def render_formset_200():
+    form = ProjectForm(instance=make_project(200))
+    return lambda: (form.render(), form.js)
+
+
+@case(number=1)
+def render_table_formset_200():
+    form = ProjectTableForm(instance=make_project(200))
+    return lambda: (form.render(), form.js)
+
+
+@case(number=1)
+def render_cached_rows_formset_200():
+    from forms.fragments import LRUCache
+
+    class CachedJobForm(JobForm):
+        fragment_cache = LRUCache(1000)
+
+    class CachedProjectForm(ProjectForm):
+        jobs = forms.FormsetField(form_class=CachedJobForm)
+
+    form = CachedProjectForm(instance=make_project(200))
+    return lambda: form.render()
+
+
+@case(number=1, size=True)
+def render_table_1000():
+    form = ProjectTableForm(instance=make_project(1000))
+    return lambda: form.render()
+
+
+@case(number=1, size=True)
+def render_header_table_1000():
+    form = ProjectHeaderTableForm(instance=make_project(1000))
+    return lambda: form.render()
+
+
+@case(number=1, memory=True)
+def render_encode_table_1000():
+    form = ProjectTableForm(instance=make_project(1000))
+    return lambda: io.BytesIO().write(form.render().encode())
+
+
+@case(number=1, memory=True)
+def render_into_table_1000():
+    form = ProjectTableForm(instance=make_project(1000))
+    return lambda: form.render_into(io.BytesIO())
+
+
+def make_projects(count):
+    """ At least `count` projects with three jobs, profile and tags each """
+    tags = list(Tag.objects.all()[:3])
+
+    for i in range(Project.objects.count(), count):
+        project = Project.objects.create(name='Project %d' % i, description='Description')
+        Profile.objects.create(project=project, title='Profile')
+        project.tags.set(tags)
+        Job.objects.bulk_create([Job(project=project, name='Job %d' % j, hours=j) for j in range(3)])
+
+    return Project.objects.order_by('pk')[:count]
+
+
+@case(number=1, queries=True)
+def form_loop_200():
+    queryset = make_projects(200)
+    return lambda: [ProjectTableForm(instance=p, prefix='grid-%d-' % p.pk) for p in queryset.all()]
+
+
+@case(number=1, queries=True)
+def form_grid_200():
+    queryset = make_projects(200)
+    return lambda: forms.FormGrid(ProjectTableForm, queryset.all())
+
+
+@case(number=1)
+def is_valid_bulk_1000():
+    form = ProjectForm(instance=Project())
+    form.load(make_post(1000, invalid_every=2))
+    children = list(form.fields['jobs'].forms.values())
+
+    def run():
+        for child in children:
+            child.errors = dict()
+            child.is_valid()
+
+    return run
+
+
+@case(number=1, repeat=3, queries=True)
+def save_formset_100():
+    project = make_project(100)
+    data = make_post(100, project)
+
+    def run():
+        form = ProjectForm(instance=Project.objects.get(pk=project.pk))
+        form.load(data)
+        form.save()
+
+    return run
+
+
+def save_formset(rows, atomic, form_class=ProjectForm):
+    project = make_project(rows)
+    data = make_post(rows, project)
+
+    def run():
+        form = form_class(instance=Project.objects.get(pk=project.pk))
+        form.load(data)
+        form.save(atomic=atomic)
+
+    return run
+
+
+@case(number=1, repeat=3, queries=True)
+def save_formset_200():
+    return save_formset(200, False)
+
+
+@case(number=1, repeat=3, queries=True)
+def save_formset_200_atomic():
+    return save_formset(200, True)
+
+
+@case(number=1, repeat=3, queries=True)
+def save_formset_200_batched():
+    return save_formset(200, True, BatchProjectForm)
+
+
+def save_edits(rows, form_class):
+    """ Every run changes name of every row """
+    project = make_project(rows)
+    posts = [make_post(rows, project), make_post(rows, project)]
+
+    for key, value in posts[1].items():
+        if key.endswith('-name'):
+            posts[1][key] = value + ' changed'
+
+    runs = [0]
+
+    def run():
+        runs[0] += 1
+        form = form_class(instance=Project.objects.get(pk=project.pk))
+        form.load(posts[runs[0] % 2])
+        form.save(atomic=True)
+
+    return run
+
+
+@case(number=1, repeat=3, queries=True)
+def save_edits_200():
+    return save_edits(200, ProjectForm)
+
+
+@case(number=1, repeat=3, queries=True)
+def save_edits_200_batched():
+    return save_edits(200, BatchProjectForm)
+
+
+@case(number=1, repeat=3, queries=True)
+def save_new_formset_200_batched():
+    data = make_post(200)
+
+    def run():
+        form = BatchProjectForm(instance=Project())
+        form.load(data)
+        form.save()
+
+    return run
+
+
+@case(number=1, repeat=3, queries=True)
+def save_new_formset_200():
+    data = make_post(200)
+
+    def run():
+        form = ProjectForm(instance=Project())
+        form.load(data)
+        form.save(atomic=True)
+
+    return run
+
+
+@case(number=1, repeat=3, queries=True)
+def bulk_import_csv_10000():
+    from .bulk_import import JobImportForm, iter_csv
+    from forms.importer import BulkImporter, CsvSource
+
+    project = Project.objects.create(name='Import')
+    return lambda: BulkImporter(JobImportForm, Job, chunk_size=2000).run(CsvSource(iter_csv(project, 10000)))
+
+
+@case(number=1)
+def dynamic_object_from_any():
+    text = json.dumps([{'id': i, 'name': 'Item %d' % i, 'tags': [{'name': 'a'}, {'name': 'b'}],
+                        'meta': {'created': '2020-01-01', 'size': i}} for i in range(5000)])
+    data = json.loads(text)
+    return lambda: DynamicObject.from_any(data)
+
+
+@case(number=10)
+def state_token_decode_1000():
+    token = state.dumps(make_state(1000), key='benchmark')
+    return lambda: state.loads(token, key='benchmark')
+
@@ -0,0 +1,38 @@
+"""
+Django environment for benchmarks: in-memory SQLite and models of benchmarks app
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+_ready = False
+
+
+def setup():
+    global _ready
+
+    if _ready:
+        return
+
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure(
+            SECRET_KEY='benchmarks',
+            INSTALLED_APPS=['forms.benchmarks'],
+            DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+            DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+        )
+
+    django.setup()
+
+    from django.apps import apps
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config('benchmarks').get_models():
+            editor.create_model(model)
+
+    _ready = True
@@ -0,0 +1,75 @@
+"""
+Import time of core modules measured by python -X importtime in fresh interpreters
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py forms.forms --repeat 10
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure(module):
+    """ Imported modules as (name, self us, cumulative us, depth) and list of loaded django modules """
+    code = 'import sys, %s; print(",".join(m for m in sys.modules if m.startswith("django")))' % module
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            env=env, capture_output=True, text=True, check=True)
+
+    rows = list()
+
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+
+        if match is not None:
+            own, cumulative, indent, name = match.groups()
+            rows.append((name, int(own), int(cumulative), (len(indent) - 1) // 2))
+
+    loaded = [m for m in result.stdout.strip().split(',') if m]
+    return rows, loaded
+
+
+def direct_imports(rows, module):
+    """ importtime lists imports of module right before it, one level deeper """
+    index = next(i for i, r in enumerate(rows) if r[0] == module)
+    depth = rows[index][3]
+    children = list()
+
+    for row in reversed(rows[:index]):
+        if row[3] <= depth:
+            break
+
+        if row[3] == depth + 1:
+            children.append(row)
+
+    return children
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import time of forms modules')
+    parser.add_argument('modules', nargs='*', default=['forms.html', 'forms.model', 'forms.forms'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8, help='show heaviest direct imports of module')
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        rows, loaded = min(runs, key=lambda run: next(r[2] for r in run[0] if r[0] == module))
+        total = next(r for r in rows if r[0] == module)
+
+        print('%-16s %8.1f ms  django modules loaded: %d' % (module, total[2] / 1000, len(loaded)))
+
+        children = direct_imports(rows, module)
+        for name, own, cumulative, _ in sorted(children, key=lambda r: -r[2])[:args.top]:
+            print('    %-28s %8.1f ms' % (name, cumulative / 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import uuid
+
+from django.db import models
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Project(models.Model):
+    name = models.CharField(max_length=100)
+    description = models.TextField(default='')
+    tags = models.ManyToManyField(Tag, blank=True)
+
+
+class Profile(models.Model):
+    project = models.OneToOneField(Project, related_name='profile', on_delete=models.CASCADE)
+    title = models.CharField(max_length=100, default='')
+
+
+class Job(models.Model):
+    project = models.ForeignKey(Project, related_name='jobs', on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+    hours = models.IntegerField(default=0)
+
+
+class Address(models.Model):
+    city = models.CharField(max_length=100, default='')
+
+
+class Company(models.Model):
+    name = models.CharField(max_length=100)
+    address = models.ForeignKey(Address, related_name='companies', on_delete=models.PROTECT)
+    billing_address = models.ForeignKey(Address, related_name='+', null=True, on_delete=models.SET_NULL)
+
+
+class Ticket(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    title = models.CharField(max_length=100)
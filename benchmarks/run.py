@@ -0,0 +1,148 @@
+"""
+Run benchmark suite, store results as JSON and compare with previous run
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json --threshold 0.2
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import tracemalloc
+import argparse
+import platform
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def run_case(case):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    func = case.func()
+
+    # warm up
+    func()
+
+    timings = timeit.repeat(func, number=case.number, repeat=case.repeat)
+    timings = [t / case.number for t in timings]
+
+    result = {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'number': case.number,
+        'repeat': case.repeat,
+        'queries': None,
+        'peak_memory': None,
+        'size': None,
+    }
+
+    if case.queries:
+        with CaptureQueriesContext(connection) as context:
+            func()
+        result['queries'] = len(context.captured_queries)
+
+    if case.memory:
+        tracemalloc.start()
+        func()
+        result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if case.size:
+        result['size'] = len(func().encode())
+
+    return result
+
+
+def compare(results, baseline, threshold):
+    """ Return report lines and number of regressions against baseline results """
+    lines = list()
+    regressions = 0
+
+    for name, result in results.items():
+        if name not in baseline:
+            lines.append('%-28s %12s' % (name, 'new'))
+            continue
+
+        base = baseline[name]
+        ratio = result['median'] / base['median'] if base['median'] else 1.0
+
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+        elif ratio < 1 - threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+
+        if result['queries'] is not None and base.get('queries') is not None \
+                and result['queries'] > base['queries']:
+            status = 'REGRESSION (queries %d -> %d)' % (base['queries'], result['queries'])
+
+        if status.startswith('REGRESSION'):
+            regressions += 1
+
+        lines.append('%-28s %10.3f ms %10.3f ms %6.2fx  %s' % (
+            name, base['median'] * 1000, result['median'] * 1000, ratio, status))
+
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Form lifecycle benchmarks')
+    parser.add_argument('-k', dest='keyword', default=None, help='run only cases containing keyword')
+    parser.add_argument('--output', default=None, help='write results to JSON file')
+    parser.add_argument('--compare', default=None, help='JSON file of previous run')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown of median, 0.25 = 25%%')
+    args = parser.parse_args(argv)
+
+    from forms.benchmarks.cases import CASES
+
+    results = dict()
+
+    for case in CASES:
+        if args.keyword and args.keyword not in case.name:
+            continue
+
+        result = run_case(case)
+        results[case.name] = result
+
+        queries = '' if result['queries'] is None else '  %d queries' % result['queries']
+        memory = '' if result['peak_memory'] is None else '  %.1f KiB peak' % (result['peak_memory'] / 1024)
+        size = '' if result['size'] is None else '  %.1f KiB output' % (result['size'] / 1024)
+        print('%-28s %10.3f ms%s%s%s' % (case.name, result['median'] * 1000, queries, memory, size))
+
+    if args.output:
+        import django
+
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'machine': platform.machine(),
+                },
+                'results': results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+        lines, regressions = compare(results, baseline, args.threshold)
+        print()
+        print('%-28s %13s %13s %7s' % ('case', 'baseline', 'current', 'ratio'))
+        print('\n'.join(lines))
+
+        if regressions:
+            print('\n%d regression(s) above threshold %.0f%%' % (regressions, args.threshold * 100))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Size and decode time of form state token for formset of N rows
+
+    python benchmarks/state_token.py 1000
+"""
+import os
+import sys
+import json
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms import state
+
+
+def make_state(rows):
+    jobs = [[str(i), i + 1, {'id': i + 1, 'name': 'Job number %d' % i, 'hours': i % 40}, {}]
+            for i in range(rows)]
+    return ['ProjectForm', 1, {'jobs': jobs, 'tags': [[1, 2, 3], [[1, 'a'], [2, 'b'], [3, 'c']]]}]
+
+
+def main(rows=1000, number=100):
+    data = make_state(rows)
+    token = state.dumps(data, key='benchmark')
+
+    raw_size = len(json.dumps(data, separators=(',', ':')))
+    encode = timeit.timeit(lambda: state.dumps(data, key='benchmark'), number=number) / number
+    decode = timeit.timeit(lambda: state.loads(token, key='benchmark'), number=number) / number
+
+    print('rows: %d' % rows)
+    print('json size: %d bytes, token size: %d bytes' % (raw_size, len(token)))
+    print('encode: %.3f ms, decode: %.3f ms' % (encode * 1000, decode * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -1,8 +1,18 @@
 import re
 import copy
-from django.db.models import QuerySet
-from django.db.models.manager import Manager
+import datetime
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
 from .html import HtmlHelper
+from . import state as form_state
+from .guard import scope
+# re-exported, used as forms.query_budget
+from .guard import query_budget, QueryBudgetExceeded  # noqa: F401
+from .validators import (RequiredValidator, IntegerValidator, DecimalValidator, DateValidator,
+                         MinLengthValidator, MaxLengthValidator, make_validator, run_validators, config_key,
+                         parse_integer, parse_decimal)
 
 
 class FormModel(object):
@@ -13,10 +23,74 @@ class FormModel(object):
         return self.item if hasattr(self, item) else None
 
 
+# checks the same rules as validators on server, see Validator.client_rule
+CLIENT_VALIDATION_JS = '''
+                (function (groups, errorClass, anchor) {
+                    function failed(rule, value) {
+                        switch (rule.rule) {
+                            case 'required': return value === null || value === '';
+                            case 'integer': return !/^\\s*[-+]?\\d+\\s*$/.test(value);
+                            case 'decimal': return !/^\\s*[-+]?(\\d+\\.?\\d*|\\.\\d+)\\s*$/.test(value);
+                            case 'min_length': return value.length < rule.value;
+                            case 'max_length': return value.length > rule.value;
+                        }
+                        return false;
+                    }
+
+                    // handler of the html form which contains controls of root form, bound once
+                    let form = $('[name="' + anchor + '"]').closest('form');
+                    let key = 'client-validation-' + anchor;
+
+                    if (form.length === 0 || form.data(key)) {
+                        return;
+                    }
+
+                    form.data(key, true);
+                    form.on('submit', function (e) {
+                        let valid = true;
+
+                        $(this).find('.client-error').filter(function () {
+                            return $(this).data('anchor') === anchor;
+                        }).remove();
+                        $(this).find('[name]').not('[type=hidden],[type=checkbox]').each(function (index, input) {
+                            let value = $(input).val();
+
+                            groups.forEach(function (group) {
+                                let match = new RegExp('^' + group[0] + '(.+)$').exec(input.name);
+                                let rules = match ? group[1][match[1]] || [] : [];
+
+                                for (let rule of rules) {
+                                    if (failed(rule, value)) {
+                                        valid = false;
+                                        $(input).after($('<div>').addClass(errorClass + ' client-error').data('anchor', anchor).text(rule.message));
+                                        break;
+                                    }
+                                }
+                            });
+                        });
+
+                        if (!valid) {
+                            e.preventDefault();
+                        }
+                    });
+                })([%s], '%s', %s);'''
+
+
+# key of errors of whole form, e.g. rejected submission
+NON_FIELD_ERRORS = '__all__'
+
+# raw value of field which was not cleaned yet
+_NOT_CLEANED = object()
+
+
 class ValidationError(ValueError):
     pass
 
 
+class PatchError(ValueError):
+    pass
+
+
 class FormMeta(type):
     """
     Meta class for extract fields from model
@@ -51,15 +125,137 @@ class FormMeta(type):
         return new_class
 
 
+class Relation(object):
+    """
+    Resolved model relation of relational form field. Built once per
+    (model class, form field class, attribute) and shared by process
+    """
+
+    cache = dict()
+
+    def __init__(self, model, attribute):
+        field = model._meta.get_field(attribute)
+
+        self.field = field
+        self.name = field.name
+        self.related_model = field.related_model
+        self.remote_field = field.remote_field
+        self.related_pk = field.related_model._meta.pk if field.related_model is not None else None
+
+        # reverse relation: name of foreign key on related model which points to host model
+        reverse_field = getattr(field, 'field', None)
+        self.reverse_field_name = reverse_field.name if reverse_field is not None else None
+
+        target_field = getattr(field, 'target_field', None) if field.many_to_many else None
+        self.target_field_name = target_field.name.split('.')[-1] if target_field is not None else None
+
+    @classmethod
+    def resolve(cls, model, field_class, attribute):
+        key = (model, field_class, attribute)
+
+        try:
+            return cls.cache[key]
+        except KeyError:
+            # threads racing on first use all get the object stored first
+            return cls.cache.setdefault(key, cls(model, attribute))
+
+
+class IdentityMap(object):
+    """
+    Model instances of one form tree keyed by (model, pk). Rows and nested forms pointing
+    to the same object share one instance which is saved once per save unless a later form
+    changes it again, then the last submitted values win
+    """
+
+    def __init__(self):
+        self.instances = dict()
+
+        # (model, pk) -> column values written by current save
+        self.saved = dict()
+
+        # all rows of small tables used as options, model -> list
+        self.tables = dict()
+
+    @staticmethod
+    def key(instance):
+        pk = getattr(instance, 'pk', None)
+        return (instance.__class__, pk) if pk is not None and hasattr(instance, '_meta') else None
+
+    def add(self, instance):
+        """ Return instance already known by map or remember given one """
+        key = self.key(instance)
+
+        if key is None:
+            return instance
+
+        return self.instances.setdefault(key, instance)
+
+    def get(self, model, pk):
+        return self.instances.get((model, pk))
+
+    def load(self, model, pks):
+        """ Load missing instances by one in_bulk query """
+        missing = [pk for pk in pks if (model, pk) not in self.instances]
+
+        if len(missing) > 0:
+            for pk, instance in model._default_manager.in_bulk(missing).items():
+                self.instances[(model, pk)] = instance
+
+    @staticmethod
+    def get_values(instance):
+        values = vars(instance)
+
+        # mutable values may be changed in place
+        return [copy.deepcopy(values[f.attname]) if isinstance(values.get(f.attname), (dict, list))
+                else values.get(f.attname) for f in instance._meta.concrete_fields]
+
+    def needs_save(self, instance):
+        """ True when instance was not saved yet in current save or was changed since """
+        key = self.key(instance)
+
+        if key is None or key not in self.saved:
+            return True
+
+        return self.saved[key] != self.get_values(instance)
+
+    def mark_saved(self, instance):
+        key = self.key(instance)
+
+        if key is not None:
+            self.saved[key] = self.get_values(instance)
+
+    def load_all(self, model):
+        """ All instances of model, queried once per map """
+        try:
+            return self.tables[model]
+        except KeyError:
+            pass
+
+        rows = [self.add(instance) for instance in model._default_manager.all()]
+        self.tables[model] = rows
+        return rows
+
+    def clear(self):
+        self.instances.clear()
+        self.saved.clear()
+        self.tables.clear()
+
+
 class Field(object):
     """
     Base field class for all derived classes
     """
 
+    # attributes get_validators() depends on, compared with declared field to reuse chain of form class
+    validator_attributes = ('required', 'validators')
+
+    # checkbox, hidden and multi-value controls send values the client rules can not check
+    client_validation = True
+
     def __init__(self, files=None, data=None, instance=None, label=None,
                  attributes=None, attribute=None, form=None,
                  input_type='text', required=False, apply=True, default_value=None, null_if_empty=False,
-                 empty_str_if_null=False):
+                 empty_str_if_null=False, validators=None):
         self.instance = instance
         self.data = data
         self.files = files
@@ -70,6 +266,10 @@ class Field(object):
         self.value = None
         self.old_value = None
 
+        # raw value cleaned_value was parsed from
+        self._cleaned_source = _NOT_CLEANED
+        self._cleaned_value = None
+
         self.prefix = ''
         self.form = form
         self.required = required
@@ -81,15 +281,37 @@ class Field(object):
         self.empty_str_if_null = empty_str_if_null
 
         self.attributes = attributes or dict()
+        self.validators = validators or list()
 
     def apply(self):
         if self.can_apply:
-            value = self.value
-            setattr(self.instance, self.attribute, value)
+            setattr(self.instance, self.attribute, self.cleaned_value)
+
+    def to_python(self, value):
+        """ Parse raw value to python type, raise ValueError or TypeError when it can not be parsed """
+        return value
+
+    @property
+    def cleaned_value(self):
+        """
+        Value parsed by to_python once per raw value, used by validators, apply, has_changed and to_dict.
+        Value which can not be parsed stays raw, so type validator reports it
+        """
+        value = self.value
+
+        if value is not self._cleaned_source:
+            try:
+                self._cleaned_value = self.to_python(value)
+            except (TypeError, ValueError):
+                self._cleaned_value = value
+
+            self._cleaned_source = value
+
+        return self._cleaned_value
 
     @property
     def dict_value(self):
-        return self.value
+        return self.cleaned_value
 
     def init(self):
         pass
@@ -125,10 +347,36 @@ class Field(object):
             "type": "text",
         }
 
+    def get_rule_attributes(self):
+        """ HTML constraint attributes generated from validators of field """
+        form = self.form
+
+        if form is None or self.attribute not in form.base_fields or not form.use_html_validation() \
+                or not self.client_validation:
+            return dict()
+
+        chain = self.get_validator_chain()
+
+        if chain is form.get_validator_chains()[self.attribute][0]:
+            return form.get_rule_attributes()[self.attribute]
+
+        attributes = dict()
+
+        if type(self).validate is Field.validate:
+            for validator in chain:
+                attributes.update(validator.html_attributes())
+
+        return attributes
+
+    def collect_client_rules(self):
+        """ Pairs of name prefix pattern and JSON rules of forms nested in field """
+        return list()
+
     def collect_attributes(self, extra_attributes=None):
         attributes = dict()
 
         attributes.update(self.get_control_attributes())
+        attributes.update(self.get_rule_attributes())
         attributes.update(extra_attributes or dict())
 
         if self.attributes:
@@ -139,12 +387,24 @@ class Field(object):
     def render_control(self, extra_attributes=None):
         return HtmlHelper.input(self.name, self.value, self.collect_attributes(extra_attributes))
 
+    def render_control_into(self, buffer, extra_attributes=None):
+        """ Write control as utf-8 bytes, containers of child forms stream them """
+        buffer.write(('%s' % self.render_control(extra_attributes)).encode())
+
     def render_label(self):
         return HtmlHelper.tag('label', self.label, {'class': 'form-label'})
 
     def render_errors(self):
-        if self.attribute in self.form.errors:
-            return self.form.renderer.render_errors(self, self.form.errors[self.attribute])
+        errors = self.form.errors
+
+        if len(errors) == 0:
+            return ''
+
+        # is_valid stores errors by input name, custom validation may use attribute
+        messages = errors.get(self.name) or errors.get(self.attribute)
+
+        if messages:
+            return self.form.renderer.render_errors(self, messages)
 
         return ''
 
@@ -157,9 +417,27 @@ class Field(object):
 
         self.set_value_from_data()
 
+    def load_json(self, value, files=None):
+        """ Load value from structured data, without prefixed keys """
+        self.data = None
+        self.files = files
+
+        self.set_loaded_value(value)
+
     def set_value_from_data(self):
         key = self.prefix + self.attribute
-        self.value = self.data[key] if key in self.data else None
+        self.set_loaded_value(self.data[key] if key in self.data else None)
+
+    def patch(self, op, path, value, form_patch):
+        """ Apply one patch operation addressed to this field, path is the rest of pointer """
+        if len(path) > 0:
+            raise PatchError('Field %s has no member %s' % (self.attribute, '/'.join(path)))
+
+        self.load_json(None if op == 'remove' else value, None)
+        form_patch.touch(self.form, self)
+
+    def set_loaded_value(self, value):
+        self.value = value
 
         if self.value == '' and self.null_if_empty:
             self.value = None
@@ -173,14 +451,50 @@ class Field(object):
     def after_save(self):
         pass
 
+    def get_validators(self):
+        """ Build checks from field configuration. Form compiles them once per class """
+        validators = list()
+
+        if self.required:
+            validators.append(RequiredValidator())
+
+        validators.extend(make_validator(v) for v in self.validators)
+
+        return validators
+
+    def get_validator_config(self):
+        return tuple(config_key(getattr(self, name, None)) for name in self.validator_attributes)
+
+    def get_validator_chain(self):
+        """ Chain compiled for form class, own chain when bound field was configured differently """
+        form = self.form
+
+        if form is None or self.attribute not in form.base_fields:
+            return self.get_validators()
+
+        chain = form.get_validator_chains()[self.attribute][0]
+        config = self.get_validator_config()
+
+        if config == form._validator_configs[self.attribute]:
+            return chain
+
+        own = self.__dict__.get('_own_validator_chain')
+
+        if own is None or own[0] != config:
+            own = self._own_validator_chain = (config, tuple(self.get_validators()))
+
+        return own[1]
+
+    def check(self):
+        """ Return error code of first failed check or None """
+        failed = run_validators(self.get_validator_chain(), self.cleaned_value)
+        return failed.code if failed is not None else None
+
     def validate(self):
-        if self.required and (self.value is None or self.value == ''):
-            if self.form is not None:
-                error_message = self.form.error_required_message
-            else:
-                error_message = 'Field %s is required'
+        failed = run_validators(self.get_validator_chain(), self.cleaned_value)
 
-            raise ValidationError(error_message % self.label)
+        if failed is not None:
+            raise ValidationError(failed.format_message(self))
 
     @property
     def js(self):
@@ -196,38 +510,90 @@ class Field(object):
         self.set_old_value()
 
     def has_changed(self):
-        return self.value != self.old_value
+        return self.cleaned_value != self.old_value
+
+    def is_pristine(self):
+        """ Value and nested forms are as fetched, so rendered output depends only on fetched state """
+        return not self.has_changed()
 
     def set_old_value(self):
         self.old_value = self.value
 
+    def set_prefix(self, prefix):
+        self.prefix = prefix
 
-class IntegerField(Field):
+    @property
+    def relation(self):
+        return Relation.resolve(self.instance.__class__, self.__class__, self.attribute)
 
-    def validate(self):
-        try:
-            if self.value is not None:
-                int(self.value)
-        except ValueError:
-            if self.form is not None:
-                error_message = self.form.error_integer_message
-            else:
-                error_message = 'Value of %s must be numerical'
+    def reset(self):
+        """ Clear bound values before form is bound to another instance """
+        self.data = None
+        self.files = None
+        self.value = None
+        self.old_value = None
+
+    def dump_state(self):
+        """ State that lets skip fetch() on next request. None when fetch does not query """
+        return None
 
-            raise ValidationError(error_message % self.label)
+    def restore_state(self, state):
+        self.fetch()
+
+
+class TypedField(Field):
+    """ Value is parsed to python type, type validator reports raw value which can not be parsed """
+
+    type_validator_class = None
+
+    def get_validators(self):
+        validators = super(TypedField, self).get_validators()
+        validators.insert(1 if self.required else 0, self.type_validator_class())
+        return validators
 
     def apply(self):
-        try:
-            self.value = int(self.value)
-            super(IntegerField, self).apply()
-        except TypeError:
-            pass
+        # field missing in submission keeps value of instance
+        if self.cleaned_value is not None:
+            super(TypedField, self).apply()
+
+
+class IntegerField(TypedField):
+    type_validator_class = IntegerValidator
+
+    def to_python(self, value):
+        if value is None:
+            return value
+
+        return parse_integer(value)
+
+
+class DecimalField(TypedField):
+    type_validator_class = DecimalValidator
+
+    def to_python(self, value):
+        if value is None:
+            return value
+
+        return parse_decimal(value)
+
+
+class DateField(TypedField):
+    type_validator_class = DateValidator
 
-    # def apply(self):
-    #     try:
-    #         setattr(self.instance, self.attribute, int(self.value))
-    #     except ValueError:
-    #         pass
+    def get_control_attributes(self):
+        return {
+            "type": "date",
+        }
+
+    def to_python(self, value):
+        if value is None or isinstance(value, datetime.date):
+            return value
+
+        # numbers and other json values are not dates
+        if not isinstance(value, str):
+            raise TypeError(value)
+
+        return datetime.date.fromisoformat(value.strip())
 
 
 class InputField(Field):
@@ -254,33 +620,73 @@ class NestedFormField(Field):
 
     def fetch(self):
         """ Fetch nested object from instance """
-        f = self.form.instance._meta.get_field(self.attribute)
+        f = self.relation
+        identity_map = self.form.identity_map
 
-        if hasattr(self.instance, f.name):
-            instance = getattr(self.instance, f.name)
+        # forward relation already known by form tree
+        if f.field.concrete and not f.field.is_cached(self.instance):
+            pk = getattr(self.instance, f.field.attname)
+            instance = identity_map.get(f.related_model, pk) if pk is not None else None
 
-            if isinstance(instance, QuerySet):
-                try:
-                    instance = instance.get()
-                except f.related_model.DoesNotExist:
-                    instance = f.related_model()
-            elif isinstance(instance, Manager):
-                instance = instance.first()
-                if instance is None:
-                    instance = f.related_model()
+            if instance is not None:
+                return self.create_nested_form(instance)
+
+        if hasattr(self.instance, f.name):
+            from .orm import get_related_instance
+            instance = get_related_instance(getattr(self.instance, f.name), f.related_model)
         else:
             instance = f.related_model()
 
+        self.create_nested_form(identity_map.add(instance))
+
+    def prefetch(self, rows, attribute, identity_map):
+        """ Load related instances of formset rows by one query before rows fetch them """
+        if len(rows) == 0 or not hasattr(rows[0], '_meta'):
+            return
+
+        f = Relation.resolve(rows[0].__class__, self.__class__, attribute)
+
+        if f.field.concrete:
+            pks = {getattr(row, f.field.attname) for row in rows} - {None}
+            identity_map.load(f.related_model, pks)
+        elif f.field.one_to_one:
+            related = f.related_model._default_manager.filter(**{f.reverse_field_name + '__in': rows})
+            by_host = {getattr(r, f.field.field.attname): identity_map.add(r) for r in related}
+
+            for row in rows:
+                f.field.set_cached_value(row, by_host.get(row.pk))
+
+    def create_nested_form(self, instance, state=None):
+        if self.nested_form is not None and state is None:
+            self.nested_form.set_prefix(self.prefix + '-')
+            self.nested_form.rebind(instance)
+            return
+
         # create nested form for rendering
         self.nested_form = self.form_class(
             prefix=self.prefix + '-',
             instance=instance,
-            parent_form=self.form
+            parent_form=self.form,
+            state=state
         )
 
+    def dump_state(self):
+        return self.nested_form.dump_row()
+
+    def restore_state(self, state):
+        f = self.relation
+        pk, values, fields = state
+        self.create_nested_form(form_state.make_instance(f.related_model, pk, values), fields)
+
+    nested_style = "border-left: 4px solid #eee; padding-left: 20px;"
+
     def render_control(self, extra_attributes=None):
-        return HtmlHelper.tag('div', self.nested_form.render(),
-                              {"style": "border-left: 4px solid #eee; padding-left: 20px;"})
+        return HtmlHelper.tag('div', self.nested_form.render(), {"style": self.nested_style})
+
+    def render_control_into(self, buffer, extra_attributes=None):
+        buffer.write(HtmlHelper.open_tag('div', {"style": self.nested_style}).encode())
+        self.nested_form.render_into(buffer)
+        buffer.write(b'</div>')
 
     def apply(self):
         pass
@@ -288,18 +694,58 @@ class NestedFormField(Field):
     def load(self, data=None, files=None):
         self.nested_form.load(data, files)
 
+    def load_json(self, value, files=None):
+        self.nested_form.load_json(value or dict(), files)
+
+    def set_prefix(self, prefix):
+        self.prefix = prefix
+
+        if self.nested_form is not None:
+            self.nested_form.set_prefix(prefix + '-')
+
+    def patch(self, op, path, value, form_patch):
+        form_patch.owners[self.nested_form] = self
+
+        if len(path) > 0:
+            return self.nested_form.patch_path(op, path, value, form_patch)
+
+        if op == 'remove' or not isinstance(value, dict):
+            raise PatchError('Nested form %s can be replaced only by object' % self.attribute)
+
+        for name, item in value.items():
+            self.nested_form.patch_path('replace', [name], item, form_patch)
+
+    def is_forward(self):
+        """ Host instance points to nested one by own foreign key """
+        return self.relation.field.concrete
+
+    def before_save(self):
+        # nested instance of forward relation exists before host, foreign key may be NOT NULL
+        if self.is_forward():
+            self.nested_form.save()
+            self.set_relative_fields(self.nested_form.instance)
+
     def after_save(self):
-        self.set_relative_fields(self.nested_form.instance)
-        self.nested_form.save()
+        if not self.is_forward():
+            self.set_relative_fields(self.nested_form.instance)
+            self.nested_form.save()
 
     def set_relative_fields(self, instance):
-        f = self.form.instance._meta.get_field(self.attribute)
-        setattr(instance, f.field.name, self.form.instance)
+        if self.is_forward():
+            setattr(self.instance, self.relation.name, instance)
+        else:
+            setattr(instance, self.relation.reverse_field_name, self.form.instance)
 
     @property
     def js(self):
         return self.nested_form.js
 
+    def collect_client_rules(self):
+        return self.nested_form.collect_client_rules()
+
+    def is_pristine(self):
+        return self.nested_form.is_pristine()
+
 
 class GenericNestedForm(NestedFormField):
     """
@@ -311,6 +757,9 @@ class GenericNestedForm(NestedFormField):
         super(GenericNestedForm, self).__init__(*args, **kwargs)
         self.related_field = related_field
 
+    def is_forward(self):
+        return False
+
     def set_relative_fields(self, instance):
         setattr(instance, self.related_field, self.instance)
 
@@ -329,13 +778,31 @@ class BootstrapFormRenderer(object):
     form_group_class = "form-group"
     form_error_class = 'form-error'
 
+    # class of every control, None renders bare controls
+    control_class = 'form-control'
+
+    # compiled render plans: (form class, renderer class) -> list of static strings and dynamic slots
+    _plans = dict()
+    _encoded_plans = dict()
+
     def __init__(self, form):
         self.form = form
 
     def render_errors(self, field, errors):
         return HtmlHelper.tag('div', ', '.join(errors), {'class': self.form_error_class})
 
+    def get_control_attributes(self, field):
+        if self.control_class is None:
+            return {'id': field.id}
+
+        return {'class': self.control_class, 'id': field.id}
+
     def render_form(self, field):
+        plan = self.get_plan()
+
+        if plan is not None and self.has_class_labels():
+            return self.render_plan(plan)
+
         out = list()
 
         for name, field in self.form.fields.items():
@@ -348,164 +815,891 @@ class BootstrapFormRenderer(object):
         if isinstance(field, HiddenIdField):
             return field.render_control()
 
-        extra_attributes = {
-            'class': 'form-control',
-            'id': field.id
-        }
-
         return '<div class="%s">%s%s%s</div>' % (
             self.form_group_class,
             field.render_label(),
-            field.render_control(extra_attributes=extra_attributes),
+            field.render_control(extra_attributes=self.get_control_attributes(field)),
             field.render_errors()
         )
 
-
-class TableFormRenderer(BootstrapFormRenderer):
-
-    def render_field(self, field):
+    def compile_field(self, field):
+        """ Same markup as render_field split into static strings and dynamic slots """
         if isinstance(field, HiddenIdField):
-            return field.render_control()
+            return [('control', field.attribute)]
 
-        extra_attributes = {
-            'class': 'form-control',
-            'id': field.id
-        }
-
-        return '<td>%s%s%s</td>' % (
-            field.render_label(),
-            field.render_control(extra_attributes=extra_attributes),
-            field.render_errors())
+        return ['<div class="%s">' % self.form_group_class, self.compile_label(field),
+                ('control_attributes', field.attribute), ('errors', field.attribute), '</div>']
 
+    def compile_label(self, field):
+        """ Label is static markup only when it is plain str declared on form class, lazy labels stay a slot """
+        declared = self.form.base_fields.get(field.attribute)
 
-class Form(object, metaclass=FormMeta):
-    """
-    Main form class
-    """
+        if type(field).render_label is Field.render_label and type(field).label is Field.label \
+                and declared is not None and field._label is declared._label \
+                and (field._label is None or type(field._label) is str):
+            return '%s' % field.render_label()
 
-    error_required_message = 'Field %s is required'
+        return 'label', field.attribute
 
-    def __init__(self, instance=None, data=None, files=None, parent_form=None, fields=None, prefix='', template=None,
-                 renderer_class=BootstrapFormRenderer):
-        self.template = template if template is not None else 'forms/form.html'
+    def has_class_labels(self):
+        """ True when bound fields keep labels of form class the plan was compiled with """
+        base_fields = self.form.base_fields
 
-        self.instance = instance
-        self.data = data or list()
-        self.files = files or list()
-        self.parent_form = parent_form
-        self.renderer = renderer_class(self)
+        for name, field in self.form.fields.items():
+            declared = base_fields.get(name)
 
-        self.prefix = prefix
+            if declared is not None and field._label is not declared._label:
+                return False
 
-        # self.fields = fields or list()
-        self.fields_config = fields
-        self.errors = dict()
-        self.fields = dict()
+        return True
 
-        # initialize fields
-        for name, field in self.found_fields.items():
-            self.fields[name] = copy.deepcopy(field)
-            self.fields[name].form = self
-            self.fields[name].attribute = name
-            self.fields[name].instance = self.instance
-            self.fields[name].prefix = self.prefix
-            self.fields[name].fetch()
+    def has_declared_fields(self):
+        """ Plan holds declared fields, forms which added or dropped fields use render_field """
+        return tuple(self.form.fields) == tuple(self.form.base_fields)
 
-    def init(self):
-        pass
+    def get_plan(self):
+        if not self.has_declared_fields():
+            return None
 
-    def load(self, data=None, files=None):
-        self.data = data
-        self.files = files
+        key = (self.form.__class__, self.__class__)
 
-        for name, field in self.fields.items():
-            field.load(data, files)
+        try:
+            return self._plans[key]
+        except KeyError:
+            pass
 
-    def normalize_field_config(self, config) -> list:
+        return self._plans.setdefault(key, self.compile_plan())
 
-        out_fields = []
-        field_description = dict()
+    def compile_plan(self):
+        """
+        Compile render_form output of form class once. Returns None when renderer
+        overrides render_field without compile_field
+        """
+        renderer_class = self.__class__
 
-        for f in config:
-            if isinstance(f, dict):
-                field_description = f
+        owner = next(c for c in renderer_class.__mro__ if 'render_field' in c.__dict__)
+        if 'compile_field' not in owner.__dict__:
+            return None
 
-            if isinstance(f, str):
-                field_description = {
-                    'attribute': f,
-                    'classname': Field,
-                }
+        parts = list()
 
-            if 'fields' in field_description:
-                field_description['fields'] = self.normalize_field_config(
-                    field_description['fields'])
+        for name, field in self.form.fields.items():
+            if type(field).render is not Field.render:
+                parts.append(('render', name))
+            else:
+                parts.extend(self.compile_field(field))
 
-            if 'classname' not in field_description:
-                field_description['classname'] = Field
+        # merge neighbour static strings
+        plan = list()
 
-            out_fields.append(field_description)
+        for part in parts:
+            if isinstance(part, str) and len(plan) > 0 and isinstance(plan[-1], str):
+                plan[-1] += part
+            else:
+                plan.append(part)
 
-        return out_fields
+        return plan
 
-    def save(self):
-        for _, f in self.fields.items():
-            f.before_save()
+    def get_encoded_plan(self):
+        """ Plan with static strings encoded to utf-8 once """
+        if not self.has_declared_fields():
+            return None
 
-        self.before_save()
+        key = (self.form.__class__, self.__class__)
 
-        for _, f in self.fields.items():
-            f.apply()
+        try:
+            return self._encoded_plans[key]
+        except KeyError:
+            pass
 
-        self.after_apply()
+        plan = self.get_plan()
 
-        self.instance.save()
+        if plan is not None:
+            plan = [part.encode() if isinstance(part, str) else part for part in plan]
 
-        for _, f in self.fields.items():
-            f.after_save()
+        return self._encoded_plans.setdefault(key, plan)
 
-        return True
+    def render_form_into(self, buffer):
+        plan = self.get_encoded_plan()
 
-    def render(self):
-        return self.renderer.render_form(self)
+        if plan is None or not self.has_class_labels():
+            buffer.write(self.render_form(self.form).encode())
+            return
 
-    def add_field_error(self, field, error):
-        if field not in self.errors:
-            self.errors[field] = list()
+        fields = self.form.fields
 
-        self.errors[field].append(error)
+        for part in plan:
+            if part.__class__ is bytes:
+                buffer.write(part)
+                continue
 
-    def is_valid(self):
-        valid = True
+            slot, name = part
+            field = fields[name]
+
+            if slot == 'control_attributes':
+                field.render_control_into(buffer, self.get_control_attributes(field))
+            elif slot == 'errors':
+                buffer.write(('%s' % field.render_errors()).encode())
+            elif slot == 'control':
+                field.render_control_into(buffer)
+            elif slot == 'label':
+                buffer.write(('%s' % field.render_label()).encode())
+            else:
+                buffer.write(('%s' % field.render()).encode())
 
-        for _, f in self.fields.items():
-            try:
-                f.validate()
-            except ValidationError as err:
-                valid = False
-                self.add_field_error(f.name, str(err))
+    def render_plan(self, plan):
+        fields = self.form.fields
+        out = list()
 
-        self.custom_validation()
+        for part in plan:
+            if part.__class__ is str:
+                out.append(part)
+                continue
 
-        return valid and len(self.errors.items()) == 0
+            slot, name = part
+            field = fields[name]
+
+            if slot == 'control_attributes':
+                out.append('%s' % field.render_control(extra_attributes=self.get_control_attributes(field)))
+            elif slot == 'errors':
+                out.append('%s' % field.render_errors())
+            elif slot == 'control':
+                out.append('%s' % field.render_control())
+            elif slot == 'label':
+                out.append('%s' % field.render_label())
+            else:
+                out.append('%s' % field.render())
 
-    def custom_validation(self):
-        pass
+        return ''.join(out)
 
-    def __str__(self):
-        return self.render()
 
-    @property
-    def js(self):
-        fields_js = list()
+class TableFormRenderer(BootstrapFormRenderer):
 
-        for _, f in self.fields.items():
-            fields_js.append("(function (el) { %s })($('#%s'));" % (f.js, f.id))
+    def render_field(self, field):
+        if isinstance(field, HiddenIdField):
+            return field.render_control()
 
+        return '<td>%s%s%s</td>' % (
+            field.render_label(),
+            field.render_control(extra_attributes=self.get_control_attributes(field)),
+            field.render_errors())
+
+    def compile_field(self, field):
+        if isinstance(field, HiddenIdField):
+            return [('control', field.attribute)]
+
+        return ['<td>', self.compile_label(field), ('control_attributes', field.attribute),
+                ('errors', field.attribute), '</td>']
+
+
+class TableRowRenderer(TableFormRenderer):
+    """
+    Compact row of table with header: labels are rendered once in <thead> by container,
+    cells hold bare control and errors of field when it has them
+    """
+
+    control_class = None
+
+    def get_control_attributes(self, field):
+        # id is only needed by script of field
+        if type(field).js is Field.js:
+            return None
+
+        return {'id': field.id}
+
+    def render_field(self, field):
+        if isinstance(field, HiddenIdField):
+            return field.render_control()
+
+        return '<td>%s%s</td>' % (
+            field.render_control(extra_attributes=self.get_control_attributes(field)),
+            field.render_errors())
+
+    def compile_field(self, field):
+        if isinstance(field, HiddenIdField):
+            return [('control', field.attribute)]
+
+        return ['<td>', ('control_attributes', field.attribute), ('errors', field.attribute), '</td>']
+
+
+class TemplateFormRenderer(BootstrapFormRenderer):
+    """
+    Renders form and fields with `template` attribute through django template engine
+    (django or jinja2 backend). Fields without template are rendered as bootstrap markup
+    """
+
+    # alias of engine from TEMPLATES setting, None for default
+    template_engine = None
+
+    # compiled templates shared by process: (renderer class, template name) -> template or None
+    _templates = dict()
+
+    # template contexts of current thread by autoescape, values of every render are pushed on top
+    _local = threading.local()
+
+    @classmethod
+    def get_template(cls, name):
+        key = (cls, name)
+
+        try:
+            return cls._templates[key]
+        except KeyError:
+            pass
+
+        from django.template import TemplateDoesNotExist
+        from django.template.loader import get_template
+
+        try:
+            template = get_template(name, using=cls.template_engine)
+        except TemplateDoesNotExist:
+            template = None
+
+        return cls._templates.setdefault(key, template)
+
+    def render_template(self, template, values):
+        from django.template.backends.django import Template as DjangoTemplate
+
+        if not isinstance(template, DjangoTemplate):
+            return template.render(values)
+
+        context = self.get_context(template.backend.engine.autoescape)
+
+        with context.push(values):
+            return template.template.render(context)
+
+    @classmethod
+    def get_context(cls, autoescape):
+        """ Context reused by renders of one thread, form may be rendered by several threads at once """
+        contexts = getattr(cls._local, 'contexts', None)
+
+        if contexts is None:
+            contexts = cls._local.contexts = dict()
+
+        if autoescape not in contexts:
+            from django.template import Context
+            contexts[autoescape] = Context(autoescape=autoescape)
+
+        return contexts[autoescape]
+
+    def render_form(self, field):
+        template = self.get_template(self.form.template) if self.form.template else None
+
+        if template is None:
+            return super(TemplateFormRenderer, self).render_form(field)
+
+        from django.utils.safestring import mark_safe
+
+        fields = [mark_safe(f.render()) for _, f in self.form.fields.items()]
+
+        return self.render_template(template, {'form': self.form, 'fields': fields})
+
+    def render_field(self, field):
+        template_name = getattr(field, 'template', None)
+        template = self.get_template(template_name) if template_name else None
+
+        if template is None or isinstance(field, HiddenIdField):
+            return super(TemplateFormRenderer, self).render_field(field)
+
+        from django.utils.safestring import mark_safe
+
+        values = {
+            'form': self.form,
+            'field': field,
+            'label': mark_safe(field.render_label() or ''),
+            'control': mark_safe(field.render_control(extra_attributes=self.get_control_attributes(field))),
+            'errors': mark_safe(field.render_errors() or ''),
+        }
+
+        if type(field).create_context is not Field.create_context:
+            values.update(field.create_context())
+
+        return self.render_template(template, values)
+
+
+class Form(object, metaclass=FormMeta):
+    """
+    Main form class
+    """
+
+    error_required_message = 'Field %s is required'
+    error_integer_message = 'Value of %s must be numerical'
+    error_decimal_message = 'Value of %s must be a number'
+    error_date_message = 'Value of %s must be a date'
+
+    # stop validation at first invalid field
+    fail_fast = False
+
+    # render signed state of fetched relations and restore it on POST instead of querying
+    use_state_token = False
+    state_field_name = '__state__'
+    state_signing_key = None
+
+    # save whole form tree in one transaction
+    atomic_save = False
+
+    # save this form in savepoint when it is saved inside transaction
+    use_savepoint = False
+
+    # save whole form tree by unit of work (see unit_of_work.py): one bulk statement per model
+    # and dependency level instead of save() per instance. Model.save() and save signals are skipped
+    batch_save = False
+
+    # render HTML constraint attributes of validators (required, maxlength...), off for row templates
+    html_validation = True
+
+    # backend of rendered fragments (see fragments.py), None disables caching
+    fragment_cache = None
+
+    # cheap version of instance, e.g. 'updated_at', for forms which depend only on own instance.
+    # When None version is hash of fetched values of whole form tree
+    version_attribute = None
+
+    # limits of untrusted submission checked by root form before child forms are built, None disables
+    max_post_keys = 10000
+    max_child_forms = 5000
+    max_depth = 8
+    max_formset_rows = 1000
+
+    error_too_many_keys_message = 'Submission has too many fields'
+    error_too_many_rows_message = 'Maximum number of rows of %s is %d'
+    error_too_many_forms_message = 'Submission has too many rows'
+    error_too_deep_message = 'Rows of %s are nested too deep'
+    error_row_outside_window_message = 'Row %s of %s is not on the current page'
+
+    def __init__(self, instance=None, data=None, files=None, parent_form=None, fields=None, prefix='', template=None,
+                 renderer_class=BootstrapFormRenderer, state=None, identity_map=None):
+        self.template = template if template is not None else 'forms/form.html'
+
+        self.instance = instance
+        self.data = data or list()
+        self.files = files or list()
+        self.parent_form = parent_form
+        self.renderer = renderer_class(self)
+
+        # instances shared by whole form tree, or by all forms of grid
+        if identity_map is None:
+            identity_map = parent_form.identity_map if parent_form is not None else IdentityMap()
+
+        self.identity_map = identity_map
+        self.identity_map.add(instance)
+
+        # root of form tree keeps limits and counts child forms of submission
+        self.root_form = parent_form.root_form if parent_form is not None else self
+        self.depth = parent_form.depth + 1 if parent_form is not None else 0
+        self.loaded_child_forms = 0
+
+        self.prefix = prefix
+
+        # self.fields = fields or list()
+        self.fields_config = fields
+        self.errors = dict()
+
+        # parsed values of valid fields, filled by is_valid()
+        self.cleaned_data = dict()
+        self.fields = dict()
+
+        if state is None and self.use_state_token and hasattr(data, 'get'):
+            state = data.get(self.prefix + self.state_field_name)
+
+        if isinstance(state, str):
+            state = self.load_state_token(state)
+
+        # initialize fields
+        for name, field in self.found_fields.items():
+            self.fields[name] = copy.deepcopy(field)
+            self.fields[name].form = self
+            self.fields[name].attribute = name
+            self.fields[name].instance = self.instance
+            self.fields[name].prefix = self.prefix
+
+            with scope('fetch', self, self.fields[name]):
+                if state is not None and name in state:
+                    self.fields[name].restore_state(state[name])
+                else:
+                    self.fields[name].fetch()
+
+    def init(self):
+        pass
+
+    def rebind(self, instance=None, data=None, files=None):
+        """
+        Bind form to another instance in place. Field objects, child forms and renderer
+        are reused, values, errors and old values are fetched again. Data is loaded when given
+        """
+        self.instance = instance
+        self.data = data or list()
+        self.files = files or list()
+        self.errors.clear()
+        self.cleaned_data = dict()
+
+        if self.parent_form is None:
+            self.identity_map.clear()
+
+        self.identity_map.add(instance)
+
+        for name, field in self.fields.items():
+            field.reset()
+            field.instance = instance
+
+            with scope('fetch', self, field):
+                field.fetch()
+
+        if data is not None:
+            self.load(data, files)
+
+        return self
+
+    def set_prefix(self, prefix):
+        self.prefix = prefix
+
+        for name, field in self.fields.items():
+            field.set_prefix(prefix)
+
+    def load(self, data=None, files=None):
+        self.data = data
+        self.files = files
+
+        if self.parent_form is None:
+            self.loaded_child_forms = 0
+
+            if self.max_post_keys is not None and len(data) > self.max_post_keys:
+                self.add_field_error(NON_FIELD_ERRORS, self.error_too_many_keys_message)
+                return
+
+        for name, field in self.fields.items():
+            with scope('load', self, field):
+                field.load(data, files)
+
+    def load_json(self, data, files=None):
+        """
+        Load nested dict as produced by to_dict: nested forms as dicts, formset rows as lists.
+        Files are looked up by prefixed keys as in load()
+        """
+        self.data = data
+        self.files = files
+
+        if self.parent_form is None:
+            self.loaded_child_forms = 0
+
+        for name, field in self.fields.items():
+            with scope('load', self, field):
+                field.load_json(data.get(name), files)
+
+        return self
+
+    def apply_patch(self, ops, save=True):
+        """
+        Apply JSON-Patch style operations: [{'op': 'replace', 'path': '/jobs/3/name', 'value': 'x'}].
+        Supported ops are add, replace and remove, formset rows are addressed by index,
+        '/jobs/-' adds new row. Only touched fields and rows are validated and saved.
+        Returns True when patch is valid
+        """
+        form_patch = FormPatch(self)
+
+        for op in ops:
+            form_patch.apply(op)
+
+        if not form_patch.is_valid():
+            return False
+
+        if save:
+            form_patch.save()
+
+        return True
+
+    def patch_path(self, op, path, value, form_patch):
+        name = path[0]
+
+        if name not in self.fields:
+            raise PatchError('Form has no field %s' % name)
+
+        self.fields[name].patch(op, path[1:], value, form_patch)
+
+    def normalize_field_config(self, config) -> list:
+
+        out_fields = []
+        field_description = dict()
+
+        for f in config:
+            if isinstance(f, dict):
+                field_description = f
+
+            if isinstance(f, str):
+                field_description = {
+                    'attribute': f,
+                    'classname': Field,
+                }
+
+            if 'fields' in field_description:
+                field_description['fields'] = self.normalize_field_config(
+                    field_description['fields'])
+
+            if 'classname' not in field_description:
+                field_description['classname'] = Field
+
+            out_fields.append(field_description)
+
+        return out_fields
+
+    def save(self, atomic=None):
+        if self.parent_form is None:
+            self.identity_map.saved.clear()
+
+        if atomic is None:
+            atomic = self.atomic_save and self.parent_form is None
+
+        if not hasattr(self.instance, '_meta') or not (atomic or self.use_savepoint):
+            return self.write_tree()
+
+        from django.db import transaction
+
+        # root transaction does not need savepoint even inside outer transaction
+        with transaction.atomic(using=self.get_db_alias(), savepoint=not atomic):
+            return self.write_tree()
+
+    def write_tree(self):
+        """ save_tree, or unit of work of whole tree when root form has batch_save """
+        if self.batch_save and self.parent_form is None and hasattr(self.instance, '_meta'):
+            from .unit_of_work import UnitOfWork
+            return UnitOfWork(self).run()
+
+        return self.save_tree()
+
+    def get_db_alias(self):
+        from django.db import router
+        return router.db_for_write(self.instance.__class__, instance=self.instance)
+
+    def on_commit(self, func):
+        """ Run func after transaction commit, immediately when not in transaction """
+        if not hasattr(self.instance, '_meta'):
+            return func()
+
+        from django.db import transaction
+        transaction.on_commit(func, using=self.get_db_alias())
+
+    def save_tree(self):
+        with scope('save', self):
+            for _, f in self.fields.items():
+                with scope('save', self, f):
+                    f.before_save()
+
+            self.before_save()
+
+            for _, f in self.fields.items():
+                f.apply()
+
+            self.after_apply()
+
+            if self.identity_map.needs_save(self.instance):
+                self.instance.save()
+                self.identity_map.mark_saved(self.instance)
+
+            for _, f in self.fields.items():
+                with scope('save', self, f):
+                    f.after_save()
+
+            self.after_save()
+
+        if type(self).after_commit is not Form.after_commit:
+            self.on_commit(self.after_commit)
+
+        return True
+
+    def render(self):
+        out = self.render_fragment()
+
+        if self.use_state_token and self.parent_form is None:
+            out += self.render_state_input()
+
+        return out
+
+    def render_fragment(self):
+        """ Renderer output, served from fragment cache while form is unchanged since fetch """
+        key = self.get_fragment_key() if self.fragment_cache is not None else None
+
+        if key is None:
+            return self.renderer.render_form(self)
+
+        out = self.fragment_cache.get(key)
+
+        if out is None:
+            out = self.renderer.render_form(self)
+            self.fragment_cache.set(key, out)
+
+        return out
+
+    def is_pristine(self):
+        if len(self.errors) > 0:
+            return False
+
+        return all(f.is_pristine() for _, f in self.fields.items())
+
+    def get_version(self):
+        if self.version_attribute is not None and getattr(self.instance, 'pk', None) is not None:
+            return '%s-%s' % (self.instance.pk, getattr(self.instance, self.version_attribute))
+
+        row = json.dumps(self.dump_row(), default=str, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(row.encode()).hexdigest()
+
+    def get_fragment_key(self):
+        """ Cache key of rendered form, None when form was changed after fetch or has errors """
+        if not self.is_pristine():
+            return None
+
+        cls = self.__class__
+
+        return '%s.%s:%s:%s:%s:%s' % (cls.__module__, cls.__qualname__, self.renderer.__class__.__name__,
+                                      self.template, self.prefix, self.get_version())
+
+    @property
+    def etag(self):
+        """ ETag of rendered form for conditional GET, None when form is not cacheable """
+        key = self.get_fragment_key()
+        return '"%s"' % hashlib.sha1(key.encode()).hexdigest() if key is not None else None
+
+    def render_into(self, buffer):
+        """
+        Write rendered form as utf-8 bytes to object with write(bytes) method, static markup
+        is encoded once per form class. Same output as render().encode()
+        """
+        if self.fragment_cache is not None:
+            buffer.write(self.render_fragment().encode())
+        elif hasattr(self.renderer, 'render_form_into'):
+            self.renderer.render_form_into(buffer)
+        else:
+            buffer.write(self.renderer.render_form(self).encode())
+
+        if self.use_state_token and self.parent_form is None:
+            buffer.write(self.render_state_input().encode())
+
+    def dump_state(self):
+        """ Collect state of fields which query database on fetch """
+        out = dict()
+
+        for name, f in self.fields.items():
+            field_state = f.dump_state()
+            if field_state is not None:
+                out[name] = field_state
+
+        return out
+
+    def dump_row(self):
+        """ State of child form: instance pk, fetched values and fields state """
+        values = {name: f.old_value for name, f in self.fields.items()}
+        return [getattr(self.instance, 'pk', None), values, self.dump_state()]
+
+    def get_state_token(self):
+        pk = getattr(self.instance, 'pk', None)
+        return form_state.dumps([self.__class__.__name__, pk, self.dump_state()], self.state_signing_key)
+
+    def load_state_token(self, token):
+        try:
+            name, pk, state = form_state.loads(token, self.state_signing_key)
+        except (form_state.BadStateToken, TypeError, ValueError):
+            return None
+
+        # token of another form or instance, fetch from database
+        if name != self.__class__.__name__ or str(pk) != str(getattr(self.instance, 'pk', None)):
+            return None
+
+        return state
+
+    def render_state_input(self):
+        return HtmlHelper.tag('input', None, {
+            'type': 'hidden',
+            'name': self.prefix + self.state_field_name,
+            'value': self.get_state_token(),
+        })
+
+    def add_field_error(self, field, error):
+        if field not in self.errors:
+            self.errors[field] = list()
+
+        self.errors[field].append(error)
+
+    @classmethod
+    def get_validator_chains(cls):
+        """
+        Compile validators of declared fields once per form class.
+        Fields with overridden validate() are marked to be validated the old way
+        """
+        chains = cls.__dict__.get('_validator_chains')
+
+        if chains is None:
+            chains = dict()
+            configs = dict()
+
+            for name, field in cls.base_fields.items():
+                chains[name] = (tuple(field.get_validators()), type(field).validate is not Field.validate)
+                configs[name] = field.get_validator_config()
+
+            # bound fields configured differently than declared ones build own chains
+            cls._validator_configs = configs
+            cls._validator_chains = chains
+
+        return chains
+
+    def is_valid(self, fail_fast=None):
+        if fail_fast is None:
+            fail_fast = self.fail_fast
+
+        valid = True
+        chains = self.get_validator_chains()
+        cleaned_data = self.cleaned_data = dict()
+
+        for name, f in self.fields.items():
+            # field added to instance has no chain of form class
+            _, custom_validate = chains[name] if name in chains else self.get_field_validator_chain(name, f)
+
+            if custom_validate:
+                try:
+                    f.validate()
+                    cleaned_data[name] = f.cleaned_value
+                    continue
+                except ValidationError as err:
+                    error = str(err)
+            else:
+                value = f.cleaned_value
+                failed = run_validators(f.get_validator_chain(), value)
+                if failed is None:
+                    cleaned_data[name] = value
+                    continue
+                error = failed.format_message(f)
+
+            valid = False
+            self.add_field_error(f.name, error)
+
+            if fail_fast:
+                return False
+
+        with scope('validate', self):
+            self.custom_validation()
+
+        return valid and len(self.errors.items()) == 0
+
+    def custom_validation(self):
+        pass
+
+    def __str__(self):
+        return self.render()
+
+    @property
+    def js(self):
+        fields_js = self.collect_fields_js()
+
+        if self.parent_form is None:
+            fields_js.append(self.render_client_validation())
+
+        return self.wrap_js(fields_js)
+
+    def collect_fields_js(self):
+        return ["(function (el) { %s })($('#%s'));" % (f.js, f.id) for _, f in self.fields.items()]
+
+    @staticmethod
+    def wrap_js(scripts):
         return '''
             $(document).ready(function () {
                 %s
             });
-        ''' % ("\n".join(fields_js))
+        ''' % ("\n".join(scripts))
+
+    def use_html_validation(self):
+        form = self
+
+        while form is not None:
+            if not form.html_validation:
+                return False
+
+            form = form.parent_form
+
+        return True
+
+    @classmethod
+    def get_rule_attributes(cls):
+        """ HTML constraint attributes of declared fields, built once per form class. Do not modify """
+        attributes = cls.__dict__.get('_rule_attributes')
+
+        if attributes is None:
+            attributes = dict()
+
+            for name, (chain, custom_validate) in cls.get_validator_chains().items():
+                attributes[name] = dict()
+
+                # custom validate() may accept what rules of chain reject
+                if custom_validate or not cls.base_fields[name].client_validation:
+                    continue
+
+                for validator in chain:
+                    attributes[name].update(validator.html_attributes())
+
+            cls._rule_attributes = attributes
+
+        return attributes
+
+    def get_field_validator_chain(self, name, field):
+        """ Chain of form class and custom validate flag, own ones of field added to instance """
+        try:
+            return self.get_validator_chains()[name]
+        except KeyError:
+            return tuple(field.get_validators()), type(field).validate is not Field.validate
+
+    def get_client_rules(self):
+        """ JSON of client side rules of fields, built once per form class from validators """
+        cls = self.__class__
+        rules = cls.__dict__.get('_client_rules')
+
+        # fields added to instance are not shared with form class
+        cached = all(name in self.base_fields for name in self.fields)
+
+        if rules is None or not cached:
+            out = dict()
+
+            for name, field in self.fields.items():
+                chain, custom_validate = self.get_field_validator_chain(name, field)
+
+                if custom_validate or not field.client_validation:
+                    continue
+
+                field_rules = [rule for rule in (v.client_rule(field) for v in chain) if rule is not None]
+
+                if len(field_rules) > 0:
+                    out[name] = field_rules
+
+            rules = json.dumps(out, separators=(',', ':'))
+
+            if cached:
+                cls._client_rules = rules
+
+        return rules
+
+    def collect_client_rules(self):
+        """ Pairs of name prefix pattern and rules of this form and nested forms """
+        out = [(re.escape(self.prefix), self.get_client_rules())]
+
+        for _, f in self.fields.items():
+            out.extend(f.collect_client_rules())
+
+        return [(pattern, rules) for pattern, rules in out if rules != '{}']
+
+    def get_client_anchor(self):
+        """ Name of control the html form containing this form is found by """
+        for _, f in self.fields.items():
+            if not isinstance(f, (NestedFormField, FormsetField)):
+                return f.name
+
+        return None
+
+    def render_client_validation(self, pairs=None):
+        if pairs is None:
+            pairs = self.collect_client_rules()
+
+        anchor = self.get_client_anchor()
+
+        if len(pairs) == 0 or anchor is None:
+            return ''
+
+        rules = ','.join('[%s,%s]' % (json.dumps(pattern), rules) for pattern, rules in pairs)
+        return CLIENT_VALIDATION_JS % (rules, self.renderer.form_error_class, json.dumps(anchor))
 
     def before_save(self):
         pass
@@ -516,6 +1710,10 @@ class Form(object, metaclass=FormMeta):
     def after_save(self):
         pass
 
+    def after_commit(self):
+        """ Side effects of saving (mails, cache, tasks), called when transaction is committed """
+        pass
+
     @property
     def values(self):
         out = dict()
@@ -528,10 +1726,150 @@ class Form(object, metaclass=FormMeta):
         return {field_name: field.dict_value for field_name, field in self.fields.items()}
 
 
+class FormPatch(object):
+    """ Touched fields, added and removed rows of one apply_patch call """
+
+    def __init__(self, form):
+        self.form = form
+
+        # form -> touched fields, in order of touching
+        self.fields = dict()
+
+        # child form -> field which owns it (nested or formset)
+        self.owners = dict()
+
+        self.added = list()
+        self.removed = list()
+
+    @staticmethod
+    def parse_path(path):
+        if not path.startswith('/'):
+            raise PatchError('Path must start with /: %s' % path)
+
+        return [p.replace('~1', '/').replace('~0', '~') for p in path[1:].split('/')]
+
+    def apply(self, op):
+        name = op.get('op')
+
+        if name not in ('add', 'replace', 'remove'):
+            raise PatchError('Unsupported operation %s' % name)
+
+        self.form.patch_path(name, self.parse_path(op.get('path', '')), op.get('value'), self)
+
+    def touch(self, form, field):
+        fields = self.fields.setdefault(form, list())
+
+        if field not in fields:
+            fields.append(field)
+
+    def is_valid(self):
+        valid = True
+
+        for form, fields in self.fields.items():
+            if form in self.added:
+                continue
+
+            for f in fields:
+                if form.get_field_validator_chain(f.attribute, f)[1]:
+                    try:
+                        f.validate()
+                        continue
+                    except ValidationError as err:
+                        error = str(err)
+                else:
+                    failed = run_validators(f.get_validator_chain(), f.cleaned_value)
+
+                    if failed is None:
+                        continue
+
+                    error = failed.format_message(f)
+
+                valid = False
+                form.add_field_error(f.name, error)
+
+            # rules across fields see touched values together with fetched ones
+            with scope('validate', form):
+                form.custom_validation()
+
+            if len(form.errors) > 0:
+                valid = False
+
+        for form in self.added:
+            valid = form.is_valid() and valid
+
+        return valid
+
+    def save(self):
+        if hasattr(self.form.instance, '_meta'):
+            from django.db import transaction
+
+            with transaction.atomic(using=self.form.get_db_alias()):
+                with scope('save', self.form):
+                    self.save_changes()
+        else:
+            self.save_changes()
+
+    def save_changes(self):
+        for form, fields in self.fields.items():
+            if form in self.added or form in self.removed:
+                continue
+
+            if not hasattr(form.instance, '_meta') or form.instance.pk is None:
+                # instance which does not exist yet is saved whole
+                owner = self.owners.get(form)
+
+                if owner is not None:
+                    owner.set_relative_fields(form.instance)
+
+                form.save()
+
+                # existing host points to new instance of forward relation
+                if isinstance(owner, NestedFormField) and owner.is_forward() and owner.instance.pk is not None:
+                    owner.instance.save(update_fields=[owner.relation.name])
+
+                continue
+
+            for f in fields:
+                f.apply()
+
+            form.after_apply()
+
+            update_fields = self.get_update_fields(form, fields)
+
+            if len(update_fields) > 0:
+                form.instance.save(update_fields=update_fields)
+
+            for f in fields:
+                f.after_save()
+
+        for form in self.added:
+            self.owners[form].set_relative_fields(form.instance)
+            form.save()
+
+        for form in self.removed:
+            if form.instance.pk is not None:
+                form.instance.delete()
+
+    @staticmethod
+    def get_update_fields(form, fields):
+        concrete = {f.name for f in form.instance._meta.concrete_fields}
+
+        return [f.attribute for f in fields if f.can_apply and f.attribute in concrete]
+
+
 class HiddenIdField(Field):
+    client_validation = False
+
     def apply(self):
         pass
 
+    def patch(self, op, path, value, form_patch):
+        # whole rows sent back keep their id
+        if op == 'replace' and len(path) == 0 and str(value) == str(self.value):
+            return
+
+        raise PatchError('Field %s can not be patched' % self.attribute)
+
     def render_label(self):
         pass
 
@@ -558,7 +1896,8 @@ class SelectField(Field):
         self.template = 'forms/select.html'
 
     def render_control(self, extra_attributes=None):
-        attributes = self.attributes or dict()
+        attributes = dict(self.get_rule_attributes())
+        attributes.update(self.attributes)
         attributes.update(extra_attributes or dict())
 
         return HtmlHelper.select(self.name, self.value, self.options, attributes)
@@ -575,6 +1914,8 @@ class BooleanField(Field):
 
 
 class CheckBoxListField(Field):
+    client_validation = False
+
     def __init__(self, *args, options=None, **kwargs):
         self.options = options or list()
         super(CheckBoxListField, self).__init__(*args, **kwargs)
@@ -611,7 +1952,7 @@ class CheckBoxListField(Field):
                 "type": "checkbox",
                 "value": id,
                 "name": attr_name,
-                "checked": id in self.value
+                "checked": id in self.cleaned_value
             }) + ' ' + str(name)
             options.append(HtmlHelper.tag('li', input))
 
@@ -626,14 +1967,19 @@ class ManyToManyCheckBoxListField(CheckBoxListField):
         self.related_field = None
         self.remote_model_id_field = None
 
-    def fetch(self):
-        self.local_field = self.instance._meta.get_field(self.attribute)
-        self.remote_field = self.local_field.remote_field
+    def resolve_fields(self):
+        relation = self.relation
+
+        self.local_field = relation.field
+        self.remote_field = relation.remote_field
 
-        self.remote_model_id_field = self.local_field.target_field.name.split('.')[-1]
+        self.remote_model_id_field = relation.target_field_name
+
+    def fetch(self):
+        self.resolve_fields()
 
         if self.options is True:
-            all_related_class_models = self.local_field.related_model.objects.all()
+            all_related_class_models = self.form.identity_map.load_all(self.local_field.related_model)
             self.options = [
                 (
                     getattr(a, self.remote_model_id_field),
@@ -649,37 +1995,62 @@ class ManyToManyCheckBoxListField(CheckBoxListField):
                 value.append(getattr(a, self.remote_model_id_field))
 
         self.value = value
+        self.old_value = list(value)
+
+    def dump_state(self):
+        return [self.value, self.options]
+
+    def restore_state(self, state):
+        self.resolve_fields()
+        self.value, self.options = state
+        self.old_value = list(self.value)
 
     def apply(self):
         pass
 
+    def to_python(self, value):
+        """ Submitted ids parsed by primary key field of related model """
+        from django.core.exceptions import ValidationError as ModelValidationError
+
+        relation = self.relation
+        target = relation.related_model._meta.get_field(relation.target_field_name)
+
+        try:
+            return [target.to_python(v) for v in value]
+        except ModelValidationError as err:
+            raise ValueError(err)
+
     def after_save(self):
-        categories = self.local_field.related_model.objects.filter(id__in=self.value)
+        categories = self.local_field.related_model.objects.filter(id__in=self.cleaned_value)
         getattr(self.instance, self.attribute).set(categories)
 
     def set_value_from_data(self):
         key = self.prefix + self.attribute
-        self.value = self.data[key] if key in self.data else None
-        if self.value is None:
-            self.value = list()
+        self.set_loaded_value(self.data[key] if key in self.data else None)
+
+    def set_loaded_value(self, value):
+        self.value = value if value is not None else list()
 
 
 class CheckBoxField(Field):
+    client_validation = False
+
     def get_control_attributes(self):
         return {
             "type": "checkbox",
             "name": self.name
         }
 
+    def to_python(self, value):
+        return value is True or value == 1 or value == '1'
+
     def apply(self):
-        checked = self.value == '1'
-        setattr(self.instance, self.attribute, checked)
+        setattr(self.instance, self.attribute, self.cleaned_value)
 
     def render_control(self, extra_attributes=None):
         attributes = self.collect_attributes()
 
-        is_checked = True if self.value is True or self.value == 1 or self.value == '1' else False
-        attributes['checked'] = is_checked
+        attributes['checked'] = self.cleaned_value
         attributes['value'] = 1
 
         checked = HtmlHelper.tag('input', '', attributes)
@@ -693,37 +2064,150 @@ class CheckBoxField(Field):
         return hidden + checked
 
 
-class FormsetField(Field):
+class FormsetField(Field):
+    child_renderer_class = BootstrapFormRenderer
+
+    def __init__(self, form_class=None, text_delete='Delete row', text_add='Add new row', *args, window=None,
+                 max_rows=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # rows accepted from submission, max_formset_rows of root form when None
+        self.max_rows = max_rows
+
+        self.hidden_form = None
+        self.forms = dict()
+        self.form_class = form_class
+
+        # primary keys of rows restored from state token, known without query
+        self.restored_pks = None
+
+        # windowed mode: fetch only `window` rows after cursor (primary key of last row of previous window)
+        self.window = window
+        self.cursor = None
+        self.next_cursor = None
+        self.window_rows = None
+
+        # child forms of previous binding, reused by rebind
+        self.spare_forms = list()
+
+        self.text_delete = text_delete
+        self.text_add = text_add
+
+    def set_prefix(self, prefix):
+        self.prefix = prefix
+
+        for index, f in self.forms.items():
+            f.set_prefix(self.nested_form_prefix(index))
+
+        if self.hidden_form is not None:
+            self.hidden_form.set_prefix(self.nested_form_prefix('__index__'))
+
+    def reset(self):
+        super(FormsetField, self).reset()
 
-    def __init__(self, form_class=None, text_delete='Delete row', text_add='Add new row', *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        self.spare_forms.extend(self.forms.values())
+        if self.hidden_form is not None:
+            self.spare_forms.append(self.hidden_form)
 
         self.hidden_form = None
         self.forms = dict()
-        self.form_class = form_class
-
-        self.text_delete = text_delete
-        self.text_add = text_add
+        self.restored_pks = None
+        self.cursor = None
+        self.next_cursor = None
+        self.window_rows = None
 
     def set_relative_fields(self, instance):
-        f = self.form.instance._meta.get_field(self.attribute)
-        setattr(instance, f.field.name, self.form.instance)
+        setattr(instance, self.relation.reverse_field_name, self.form.instance)
 
     def fetch(self):
-        hidden_form = self.create_child_form(
-            '__index__', self.create_new_instance())
-        self.hidden_form = hidden_form
+        self.hidden_form = self.create_hidden_form()
 
         self.init_forms()
 
+    def dump_state(self):
+        rows = [[index] + f.dump_row() for index, f in self.forms.items()]
+        return [rows, self.next_cursor]
+
+    def restore_state(self, state):
+        self.hidden_form = self.create_hidden_form()
+
+        model = self.relation.related_model
+
+        self.forms = dict()
+        self.restored_pks = list()
+
+        rows, self.next_cursor = state
+
+        if self.window is not None:
+            self.cursor = self.get_cursor()
+
+        for index, pk, values, fields in rows:
+            instance = form_state.make_instance(model, pk, values)
+            self.forms[index] = self.create_child_form(index, instance, fields)
+            self.restored_pks.append(pk)
+
     def get_attr_value(self):
         if self.instance is not None and self.instance.id is not None:
             attr_value = getattr(self.instance, self.attribute).all()
+
+            if self.window is not None:
+                attr_value = self.get_window(attr_value)
         else:
             attr_value = []
 
         return attr_value
 
+    @property
+    def cursor_name(self):
+        return self.form.prefix + self.attribute + '-cursor'
+
+    def get_cursor(self):
+        data = self.form.data
+        cursor = data.get(self.cursor_name) if hasattr(data, 'get') else None
+
+        if cursor is None or cursor == '':
+            return None
+
+        from django.core.exceptions import ValidationError as ModelValidationError
+
+        pk_field = self.relation.related_pk
+
+        try:
+            return pk_field.to_python(cursor)
+        except (ValueError, ModelValidationError):
+            return None
+
+    def get_window(self, queryset):
+        """ Keyset pagination by primary key, one extra row tells if next window exists """
+        self.cursor = self.get_cursor()
+
+        queryset = queryset.order_by('pk')
+
+        if self.cursor is not None:
+            queryset = queryset.filter(pk__gt=self.cursor)
+
+        rows = list(queryset[:self.window + 1])
+
+        self.next_cursor = rows[self.window - 1].pk if len(rows) > self.window else None
+
+        return rows[:self.window]
+
+    def render_cursor(self):
+        if self.window is None:
+            return ''
+
+        return HtmlHelper.tag('input', None, {
+            'type': 'hidden',
+            'name': self.cursor_name,
+            'value': self.cursor,
+        })
+
+    def collect_window_attributes(self, attributes):
+        if self.window is not None and self.next_cursor is not None:
+            attributes['data-next-cursor'] = self.next_cursor
+
+        return attributes
+
     def render_control(self, extra_attributes=None):
         forms = [HtmlHelper.tag('div', f.render())
                  for _, f in self.forms.items()]
@@ -736,8 +2220,35 @@ class FormsetField(Field):
             'class': 'container'})
         hidden = HtmlHelper.tag('div', hidden_form, {'class': 'hidden'})
 
-        return HtmlHelper.tag('div', container + hidden + buttons,
-                              self.collect_attributes({'id': self.id}))
+        return HtmlHelper.tag('div', container + hidden + buttons + self.render_cursor(),
+                              self.collect_window_attributes(self.collect_attributes({'id': self.id})))
+
+    def render_control_into(self, buffer, extra_attributes=None):
+        attributes = self.collect_window_attributes(self.collect_attributes({'id': self.id}))
+        buffer.write(HtmlHelper.open_tag('div', attributes).encode())
+
+        buffer.write(b'<div class="container">')
+        for _, f in self.forms.items():
+            buffer.write(b'<div>')
+            f.render_into(buffer)
+            buffer.write(b'</div>')
+
+        buffer.write(b'</div><div class="hidden"><div>')
+        self.hidden_form.render_into(buffer)
+        buffer.write(b'</div></div>')
+
+        buffer.write(HtmlHelper.tag('a', self.text_add, {
+            'class': 'add btn btn-success btn-sm mt-2', 'href': '#'}).encode())
+        buffer.write(self.render_cursor().encode())
+        buffer.write(b'</div>')
+
+    def is_pristine(self):
+        return all(f.is_pristine() for _, f in self.forms.items())
+
+    def collect_client_rules(self):
+        # rules of row template cover fetched rows and rows added in browser
+        return [(pattern.replace('__index__', r'\d+'), rules)
+                for pattern, rules in self.hidden_form.collect_client_rules()]
 
     def get_max_index(self):
         form_indexes = [int(a) for a in self.forms.keys()]
@@ -819,17 +2330,26 @@ class FormsetField(Field):
                    )
 
     def init_forms(self):
-        attr_value = self.get_attr_value()
+        attr_value = [self.form.identity_map.add(a) for a in self.get_attr_value()]
+
+        if self.window is not None:
+            self.window_rows = attr_value
+
+        self.prefetch_rows(attr_value)
 
         i = 0
         for a in attr_value:
             self.forms[str(i)] = self.create_child_form(i, a)
             i += 1
 
-    def create_new_instance(self):
-        field = self.instance._meta.get_field(self.attribute)
+    def prefetch_rows(self, rows):
+        """ Related instances of nested forms of all rows are loaded at once """
+        for name, field in self.form_class.base_fields.items():
+            if isinstance(field, NestedFormField) and not isinstance(field, GenericNestedForm):
+                field.prefetch(rows, name, self.form.identity_map)
 
-        instance = field.related_model()
+    def create_new_instance(self):
+        instance = self.relation.related_model()
         return instance
 
     def load(self, data=None, files=None):
@@ -838,16 +2358,26 @@ class FormsetField(Field):
 
         prefix_pattern = self.nested_form_prefix('__index__')
         pattern = re.escape(prefix_pattern)
-        pattern = '^' + pattern.replace('__index__', '(\\d+)')
+        pattern = re.compile('^' + pattern.replace('__index__', '(\\d+)'))
 
-        forms_indexes = []
+        # ordered set of indexes, scan stops as soon as submission has too many rows
+        forms_indexes = dict()
+        max_rows = self.get_max_rows()
 
-        for key, value in data.items():
-            groups = re.match(pattern, key)
+        for key in data.keys():
+            groups = pattern.match(key)
             if groups is not None:
-                index = groups.group(1)
-                if index not in forms_indexes:
-                    forms_indexes.append(index)
+                forms_indexes[groups.group(1)] = True
+
+                if max_rows is not None and len(forms_indexes) > max_rows:
+                    break
+
+        if not self.check_rows(len(forms_indexes)):
+            return
+
+        if self.window is not None and self.restored_pks is None:
+            self.load_window(data, files, forms_indexes)
+            return
 
         new_forms = dict()
 
@@ -867,19 +2397,224 @@ class FormsetField(Field):
 
         self.forms = new_forms
 
+    def load_window(self, data, files, forms_indexes):
+        """
+        Rows of submitted page are matched to rows of window by primary key. Window is fetched
+        again when submission has other cursor than the form was built with
+        """
+        if self.get_cursor() != self.cursor:
+            self.spare_forms.extend(self.forms.values())
+            self.forms = dict()
+            self.init_forms()
+
+        pk_name = self.relation.related_pk.name
+
+        existing = dict()
+        for _, f in self.forms.items():
+            existing[str(f.instance.pk)] = f
+
+        new_forms = dict()
+
+        for index in forms_indexes:
+            if index == '__index__':
+                continue
+
+            pk = data.get(self.nested_form_prefix(index) + pk_name)
+
+            if pk is None or pk == '':
+                form = self.create_child_form(index, self.create_new_instance())
+            else:
+                form = existing.pop(str(pk), None)
+
+                # rows of other pages are never changed by this submission
+                if form is None:
+                    root = self.form.root_form
+                    self.form.add_field_error(self.attribute, root.error_row_outside_window_message % (pk, self.label))
+                    continue
+
+                form.set_prefix(self.nested_form_prefix(index))
+
+            form.load(data, files)
+            new_forms[index] = form
+
+        self.spare_forms.extend(existing.values())
+        self.forms = new_forms
+
+    @property
+    def dict_value(self):
+        rows = [f.to_dict() for _, f in self.forms.items()]
+
+        if len(rows) == 0 or not hasattr(self.instance, '_meta'):
+            return rows
+
+        # load_json matches rows by primary key, also when row form has no field for it
+        pk_name = self.relation.related_pk.name
+
+        for row, (_, f) in zip(rows, self.forms.items()):
+            if pk_name not in row and f.instance.pk is not None:
+                row[pk_name] = f.instance.pk
+
+        return rows
+
+    def get_max_rows(self):
+        return self.max_rows if self.max_rows is not None else self.form.root_form.max_formset_rows
+
+    def check_rows(self, count):
+        """ Check limits of form tree before `count` submitted rows are built, add form error when exceeded """
+        error = self.claim_rows(count, count)
+
+        if error is None:
+            return True
+
+        self.form.add_field_error(self.attribute, error)
+        return False
+
+    def claim_rows(self, count, rows):
+        """ Count `count` new child forms of `rows` rows of formset, error message when limit is exceeded """
+        form = self.form
+        root = form.root_form
+        max_rows = self.get_max_rows()
+
+        if max_rows is not None and rows > max_rows:
+            return root.error_too_many_rows_message % (self.label, max_rows)
+        elif count > 0 and root.max_depth is not None and form.depth + 1 > root.max_depth:
+            return root.error_too_deep_message % self.label
+        elif root.max_child_forms is not None and root.loaded_child_forms + count > root.max_child_forms:
+            return root.error_too_many_forms_message
+
+        root.loaded_child_forms += count
+        return None
+
+    def load_json(self, value, files=None):
+        """ Rows are matched to fetched forms by primary key, rows without it are new """
+        self.data = None
+        self.files = files
+
+        value = value or list()
+
+        # rejected rows keep fetched forms, error prevents save
+        if not self.check_rows(len(value)):
+            return
+
+        pk_name = self.relation.related_pk.name
+
+        existing = dict()
+        for _, f in self.forms.items():
+            if f.instance.pk is not None:
+                existing[str(f.instance.pk)] = f
+
+        new_forms = dict()
+
+        for index, row in enumerate(value):
+            str_index = str(index)
+            pk = row.get(pk_name)
+            form = existing.pop(str(pk), None) if pk is not None else None
+
+            if form is None:
+                form = self.create_child_form(index, self.create_new_instance())
+            else:
+                form.set_prefix(self.nested_form_prefix(index))
+
+            new_forms[str_index] = form.load_json(row, files)
+
+        self.forms = new_forms
+
+    def patch(self, op, path, value, form_patch):
+        if len(path) == 0:
+            raise PatchError('Rows of %s must be addressed by index' % self.attribute)
+
+        index = path[0]
+
+        if op == 'add' and len(path) == 1:
+            if index == '-':
+                index = str(self.get_max_index())
+
+            if index in self.forms or not index.isdigit():
+                raise PatchError('Row %s of %s can not be added' % (index, self.attribute))
+
+            # same limits as rows of submission
+            error = self.claim_rows(1, len(self.forms) + 1)
+
+            if error is not None:
+                raise PatchError(error)
+
+            form = self.create_child_form(index, self.create_new_instance())
+            form.load_json(value or dict())
+
+            self.forms[index] = form
+            form_patch.owners[form] = self
+            form_patch.added.append(form)
+            return
+
+        if index not in self.forms:
+            raise PatchError('Row %s of %s does not exist' % (index, self.attribute))
+
+        form = self.forms[index]
+        form_patch.owners[form] = self
+
+        if len(path) > 1:
+            return form.patch_path(op, path[1:], value, form_patch)
+
+        if op == 'remove':
+            del self.forms[index]
+            form_patch.removed.append(form)
+            return
+
+        if not isinstance(value, dict):
+            raise PatchError('Row of %s can be replaced only by object' % self.attribute)
+
+        for name, item in value.items():
+            form.patch_path('replace', [name], item, form_patch)
+
     def nested_form_prefix(self, index):
         return self.form.prefix + self.attribute + '-' + str(index) + '-'
 
-    def create_child_form(self, index, instance=None):
+    def create_hidden_form(self):
+        """ Template of new row. It is rendered hidden, so browser must not validate it """
+        hidden_form = self.create_child_form('__index__', self.create_new_instance())
+        hidden_form.html_validation = False
+        return hidden_form
+
+    def create_child_form(self, index, instance=None, state=None):
         form_prefix = self.nested_form_prefix(index)
+
+        if state is None and len(self.spare_forms) > 0:
+            new_form = self.spare_forms.pop()
+            new_form.set_prefix(form_prefix)
+
+            # spare form may be former row template
+            vars(new_form).pop('html_validation', None)
+
+            return new_form.rebind(instance)
+
         form_class = self.form_class
-        new_form = form_class(
-            instance=instance, prefix=form_prefix, parent_form=self.form)
+        new_form = form_class(instance=instance, prefix=form_prefix, parent_form=self.form,
+                              renderer_class=self.child_renderer_class, state=state)
         return new_form
 
+    def get_saved_rows(self):
+        """ Saved rows which are deleted when missing in submission, restored rows are known by pk only """
+        if self.restored_pks is not None:
+            return list()
+
+        if self.window is not None:
+            # rows outside of window were not shown, only shown rows can be deleted
+            return self.window_rows or list()
+
+        return [a for a in self.get_attr_value()]
+
+    def get_removed_pks(self, added):
+        """ Primary keys of saved rows which are not in added instances """
+        added_pks = {a.pk for a in added if a.pk is not None}
+        removed = [a.pk for a in self.get_saved_rows() if a.pk not in added_pks]
+
+        if self.restored_pks is not None:
+            removed.extend(pk for pk in self.restored_pks if pk is not None and pk not in added_pks)
+
+        return removed
+
     def after_save(self):
-        attr_value = self.get_attr_value()
-        attr_value = [a for a in attr_value]
+        attr_value = self.get_saved_rows()
 
         added = []
 
@@ -891,11 +2626,40 @@ class FormsetField(Field):
 
         [a.delete() for a in attr_value if a not in added]
 
+        if self.restored_pks is not None:
+            added_pks = {a.pk for a in added}
+            removed = [pk for pk in self.restored_pks if pk is not None and pk not in added_pks]
+
+            if len(removed) > 0:
+                model = self.relation.related_model
+                model._default_manager.filter(pk__in=removed).delete()
+
     def apply(self):
         pass
 
 
 class TableFormsetField(FormsetField):
+    """
+    Rows of formset in table. header=True renders labels once in <thead> and
+    compact rows by TableRowRenderer, which keeps html of large tables small
+    """
+
+    child_renderer_class = TableFormRenderer
+
+    def __init__(self, *args, header=False, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.header = header
+
+        if header:
+            self.child_renderer_class = TableRowRenderer
+
+    def render_header(self):
+        cells = [HtmlHelper.tag('th', f.label) for _, f in self.hidden_form.fields.items()
+                 if not isinstance(f, HiddenIdField)]
+
+        return HtmlHelper.tag('thead', HtmlHelper.tag('tr', ''.join(cells)))
+
     def render_control(self, extra_attributes=None):
         forms = [HtmlHelper.tag('tr', f.render())
                  for _, f in self.forms.items()]
@@ -905,18 +2669,49 @@ class TableFormsetField(FormsetField):
         buttons = HtmlHelper.tag('a', self.text_add, {
             'class': 'add', 'href': '#'})
 
-        container = HtmlHelper.tag('table', ''.join(forms), {
-            'class': 'container'})
+        if self.header:
+            container = HtmlHelper.tag('table', self.render_header() + HtmlHelper.tag('tbody', ''.join(forms), {
+                'class': 'container'}), {'class': 'table form-table'})
+        else:
+            container = HtmlHelper.tag('table', ''.join(forms), {
+                'class': 'container'})
 
         hidden = HtmlHelper.tag('table', hidden_form, {'class': 'hidden'})
 
-        return HtmlHelper.tag('div', container + hidden + buttons, {'id': self.id})
+        return HtmlHelper.tag('div', container + hidden + buttons + self.render_cursor(),
+                              self.collect_window_attributes({'id': self.id}))
+
+    def render_control_into(self, buffer, extra_attributes=None):
+        buffer.write(HtmlHelper.open_tag('div', self.collect_window_attributes({'id': self.id})).encode())
+
+        if self.header:
+            buffer.write(b'<table class="table form-table">')
+            buffer.write(self.render_header().encode())
+            buffer.write(b'<tbody class="container">')
+        else:
+            buffer.write(b'<table class="container">')
+
+        for _, f in self.forms.items():
+            buffer.write(b'<tr>')
+            f.render_into(buffer)
+            buffer.write(b'</tr>')
+
+        if self.header:
+            buffer.write(b'</tbody>')
+
+        buffer.write(b'</table><table class="hidden"><tbody><tr>')
+        self.hidden_form.render_into(buffer)
+        buffer.write(b'</tr></tbody></table>')
+
+        buffer.write(HtmlHelper.tag('a', self.text_add, {'class': 'add', 'href': '#'}).encode())
+        buffer.write(self.render_cursor().encode())
+        buffer.write(b'</div>')
 
     @property
     def js(self):
         return '''
                 let i = {max_index};
-                let container = $('#{id} > .container')
+                let container = $('#{id} {container}')
                 let button = $('#{id} > .add');
                 let hidden = $('#{id} > .hidden');
 
@@ -961,6 +2756,7 @@ class TableFormsetField(FormsetField):
                     i++;
                 }})
             '''.format(id=self.id,
+                       container='> table > .container' if self.header else '> .container',
                        max_index=self.get_max_index(),
                        init_nested_field=self.collect_fields_js(),
                        forms_js=self.collect_form_js(),
@@ -968,13 +2764,6 @@ class TableFormsetField(FormsetField):
                        text_add=self.text_add
                        )
 
-    def create_child_form(self, index, instance=None):
-        form_prefix = self.nested_form_prefix(index)
-        form_class = self.form_class
-        new_form = form_class(instance=instance, prefix=form_prefix, parent_form=self.form,
-                              renderer_class=TableFormRenderer)
-        return new_form
-
 
 class ManyToOneField(FormsetField):
     pass
@@ -992,10 +2781,47 @@ class TextAreaField(Field):
 
 
 class FileField(Field):
+    """
+    File upload field. With streaming=True uploaded file is read once by fixed size
+    chunks through pipeline stages (see uploads module) while validation
+    """
+
+    def __init__(self, *args, streaming=False, stages=None, chunk_size=None, **kwargs):
+        super(FileField, self).__init__(*args, **kwargs)
+
+        self.streaming = streaming or stages is not None
+        self.stages = stages or list()
+        self.chunk_size = chunk_size
+        self.upload_info = dict()
 
     def set_value_from_data(self):
         key = self.prefix + self.attribute
         self.value = self.files[key] if key in self.files else None
+        self.upload_info = dict()
+
+    def load_json(self, value, files=None):
+        self.files = files or dict()
+        self.set_value_from_data()
+
+    def patch(self, op, path, value, form_patch):
+        raise PatchError('File %s can not be uploaded by patch' % self.attribute)
+
+    @property
+    def dict_value(self):
+        return getattr(self.value, 'name', None) if self.value else None
+
+    def reset(self):
+        super(FileField, self).reset()
+        self.upload_info = dict()
+
+    def validate(self):
+        super(FileField, self).validate()
+
+        if self.streaming and self.value:
+            from .uploads import run_pipeline, DEFAULT_CHUNK_SIZE
+
+            self.upload_info = dict()
+            run_pipeline(self, self.value, self.stages, self.chunk_size or DEFAULT_CHUNK_SIZE)
 
     def apply(self):
         if self.can_apply and self.value:
@@ -1006,7 +2832,7 @@ class FileField(Field):
         return HtmlHelper.tag('a', f, {'href': f, 'target': '_blank'})
 
     def render_control(self, extra_attributes=None):
-        attributes = self.attributes or dict()
+        attributes = dict(self.attributes)
         attributes.update(extra_attributes or dict())
         attributes['type'] = 'file'
 
@@ -1023,6 +2849,231 @@ class EditorField(TextAreaField):
         return "CKEDITOR.replace(el[0]);"
 
 
+class FormPool(object):
+    """
+    Pool of bound forms of one class for tight loops (imports, bulk validation).
+    Released forms are rebound to next record instead of being created again
+    """
+
+    def __init__(self, form_class, **form_kwargs):
+        self.form_class = form_class
+        self.form_kwargs = form_kwargs
+        self.free = list()
+
+    def acquire(self, instance=None, data=None, files=None):
+        try:
+            # pop is atomic, pool may be used by several threads
+            form = self.free.pop()
+        except IndexError:
+            form = None
+
+        if form is not None:
+            return form.rebind(instance, data, files)
+
+        form = self.form_class(instance=instance, data=data, files=files, **self.form_kwargs)
+
+        if data is not None:
+            form.load(data, files)
+
+        return form
+
+    def release(self, form):
+        self.free.append(form)
+
+    @contextmanager
+    def form(self, instance=None, data=None, files=None):
+        form = self.acquire(instance, data, files)
+
+        try:
+            yield form
+        finally:
+            self.release(form)
+
+
+class FormGrid(object):
+    """
+    One form class bound to every instance of queryset, e.g. inline editing of list page.
+    Rows share identity map, so relations and option lists are loaded once for the whole grid:
+
+        grid = FormGrid(JobForm, Job.objects.filter(project=project))
+        grid.load(request.POST)
+
+        if grid.is_valid():
+            grid.save()
+    """
+
+    renderer_class = TableFormRenderer
+
+    def __init__(self, form_class, queryset, prefix='grid'):
+        self.form_class = form_class
+        self.prefix = prefix
+        self.identity_map = IdentityMap()
+        self.forms = dict()
+
+        rows = [self.identity_map.add(row) for row in queryset]
+        self.prefetch_rows(rows)
+
+        for row in rows:
+            self.forms[str(row.pk)] = form_class(instance=row, prefix=self.row_prefix(row.pk),
+                                                 renderer_class=self.renderer_class,
+                                                 identity_map=self.identity_map)
+
+    def row_prefix(self, pk):
+        return '%s-%s-' % (self.prefix, pk)
+
+    def prefetch_rows(self, rows):
+        """ Relations of all rows by one query per relational field """
+        if len(rows) == 0 or not hasattr(rows[0], '_meta'):
+            return
+
+        from django.db.models import prefetch_related_objects
+
+        lookups = list()
+
+        for name, field in self.form_class.base_fields.items():
+            if isinstance(field, NestedFormField) and not isinstance(field, GenericNestedForm):
+                field.prefetch(rows, name, self.identity_map)
+            elif isinstance(field, ManyToManyCheckBoxListField) \
+                    or (isinstance(field, FormsetField) and field.window is None):
+                # .all() of prefetched relation does not query
+                lookups.append(name)
+
+        if len(lookups) > 0:
+            prefetch_related_objects(rows, *lookups)
+
+    def load(self, data=None, files=None):
+        """ Only rows present in data are loaded, other rows keep fetched values """
+        prefixes = {self.row_prefix(key): key for key in self.forms}
+        start = len(self.prefix) + 1
+        keys = set()
+
+        # primary keys may contain '-', e.g. uuid, so every '-' is tried as end of row prefix
+        for name in data.keys():
+            if not name.startswith(self.prefix):
+                continue
+
+            end = name.find('-', start)
+
+            while end != -1:
+                key = prefixes.get(name[:end + 1])
+
+                if key is not None:
+                    keys.add(key)
+                    break
+
+                end = name.find('-', end + 1)
+
+        for key in keys:
+            self.forms[key].load(data, files)
+
+    def is_valid(self):
+        valid = True
+
+        for _, form in self.forms.items():
+            if not form.is_valid():
+                valid = False
+
+        return valid
+
+    @property
+    def errors(self):
+        return {key: form.errors for key, form in self.forms.items() if len(form.errors) > 0}
+
+    def can_bulk_save(self, model):
+        """
+        Form without relational fields and save hooks is saved by bulk_update, unless
+        model has own save() or save signal receivers which bulk_update would skip
+        """
+        from django.db.models import Model
+        from django.db.models.signals import pre_save, post_save
+
+        if model.save is not Model.save or pre_save.has_listeners(model) or post_save.has_listeners(model):
+            return False
+
+        form_class = self.form_class
+
+        for name, field in form_class.base_fields.items():
+            if type(field).after_save is not Field.after_save or type(field).before_save is not Field.before_save:
+                return False
+
+        return all(getattr(form_class, hook) is getattr(Form, hook)
+                   for hook in ('before_save', 'after_save', 'after_commit'))
+
+    @staticmethod
+    def changed_fields(form):
+        return [f for _, f in form.fields.items()
+                if f.has_changed() and not isinstance(f, (HiddenIdField, ReadOnlyField))]
+
+    def changed_forms(self):
+        return [form for _, form in self.forms.items() if len(self.changed_fields(form)) > 0]
+
+    def save(self):
+        """ Save changed rows in one transaction, by one bulk_update when form allows it """
+        forms = self.changed_forms()
+
+        if len(forms) == 0:
+            return 0
+
+        from django.db import router, transaction
+
+        model = forms[0].instance.__class__
+        self.identity_map.saved.clear()
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            if not self.can_bulk_save(model):
+                for form in forms:
+                    form.save_tree()
+
+                return len(forms)
+
+            update_fields = set()
+
+            for form in forms:
+                fields = self.changed_fields(form)
+
+                for f in fields:
+                    f.apply()
+
+                form.after_apply()
+                update_fields.update(FormPatch.get_update_fields(form, fields))
+
+            if len(update_fields) > 0:
+                model._default_manager.bulk_update([form.instance for form in forms], sorted(update_fields))
+
+        return len(forms)
+
+    def render(self):
+        rows = ['<tr>%s</tr>' % form.render() for _, form in self.forms.items()]
+        return HtmlHelper.tag('table', '<tbody>%s</tbody>' % ''.join(rows), {'class': 'table form-grid'})
+
+    def render_into(self, buffer):
+        buffer.write(b'<table class="table form-grid"><tbody>')
+
+        for _, form in self.forms.items():
+            buffer.write(b'<tr>')
+            form.render_into(buffer)
+            buffer.write(b'</tr>')
+
+        buffer.write(b'</tbody></table>')
+
+    def __str__(self):
+        return self.render()
+
+    @property
+    def js(self):
+        forms = [form for _, form in self.forms.items()]
+
+        if len(forms) == 0:
+            return ''
+
+        # rows are root forms, one handler validates all of them
+        scripts = [script for form in forms for script in form.collect_fields_js()]
+        scripts.append(forms[0].render_client_validation(
+            [pair for form in forms for pair in form.collect_client_rules()]))
+
+        return Form.wrap_js(scripts)
+
+
 def generate_form_class(fields, base_class=Form):
     """Create form class dynamically from fields"""
     return type('_Form', (base_class,), fields)
@@ -1035,8 +3086,17 @@ class ReadOnlyField(Field):
     def load(self, data=None, files=None):
         pass
 
+    def load_json(self, value, files=None):
+        pass
+
+    def patch(self, op, path, value, form_patch):
+        raise PatchError('Field %s is read only' % self.attribute)
+
 
 class TextField(InputField):
+    validator_attributes = Field.validator_attributes + (
+        'min_length', 'max_length', 'min_length_error_message', 'max_length_error_message')
+
     def __init__(self, *args,
                  min_length=None,
                  max_length=None,
@@ -1051,11 +3111,13 @@ class TextField(InputField):
         kwargs['input_type'] = 'text'
         super().__init__(*args, **kwargs)
 
-    def validate(self):
-        super(TextField, self).validate()
+    def get_validators(self):
+        validators = super(TextField, self).get_validators()
+
+        if self.min_length:
+            validators.append(MinLengthValidator(self.min_length, message=self.min_length_error_message))
 
-        if self.min_length and len(self.value) < self.min_length:
-            raise ValidationError(self.min_length_error_message % (self.label, self.min_length))
+        if self.max_length:
+            validators.append(MaxLengthValidator(self.max_length, message=self.max_length_error_message))
 
-        if self.max_length and len(self.value) < self.max_length:
-            raise ValidationError(self.max_length_error_message % (self.label, self.max_length))
+        return validators
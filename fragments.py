@@ -0,0 +1,97 @@
+"""
+Backends of rendered fragment cache. Form with fragment_cache serves render() from cache
+while form is unchanged since fetch:
+
+    class JobForm(forms.Form):
+        fragment_cache = LRUCache(2000)
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def hash_key(key):
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class LRUCache(object):
+    """ In-process cache of last used fragments, shared by threads """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                self.items.move_to_end(key)
+                return self.items[key]
+            except KeyError:
+                return None
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+class FileSystemCache(object):
+    """ Fragment per file, shared by processes of one host. Files are replaced atomically """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, key):
+        hashed = hash_key(key)
+        return os.path.join(self.directory, hashed[:2], hashed)
+
+    def get(self, key):
+        try:
+            with open(self.path(key), encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, value):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(value)
+
+        os.replace(temp_path, path)
+
+
+class DjangoCache(object):
+    """ Fragments in django cache from CACHES setting, keys are hashed to fit memcached limits """
+
+    def __init__(self, alias='default', timeout=None, key_prefix='forms'):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return '%s:%s' % (self.key_prefix, hash_key(key))
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def set(self, key, value):
+        self.cache.set(self.make_key(key), value, self.timeout)
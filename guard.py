@@ -0,0 +1,150 @@
+import re
+import threading
+from collections import Counter
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class _NoScope(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+NO_SCOPE = _NoScope()
+
+
+def scope(phase, form, field=None):
+    """ Lifecycle scope of form or field. Costs one lookup when no budget is active """
+    guard = getattr(_local, 'guard', None)
+
+    if guard is None:
+        return NO_SCOPE
+
+    return guard.scope(phase, form, field)
+
+
+class _Scope(object):
+    def __init__(self, guard, entry):
+        self.guard = guard
+        self.entry = entry
+
+    def __enter__(self):
+        self.guard.stack.append(self.entry)
+        return self
+
+    def __exit__(self, *args):
+        self.guard.stack.pop()
+        return False
+
+
+class QueryBudget(object):
+    """
+    Counts queries per lifecycle phase (fetch, load, save) and per field path of form tree
+    and finds repeated identical SQL coming from one field (N+1).
+
+        with query_budget(form, fetch=3, save=5):
+            ...
+    """
+
+    in_list = re.compile(r'\((?:%s, )+%s\)')
+
+    def __init__(self, form=None, using='default', raise_error=True, repeated=3, **budgets):
+        # form instance or form class, None counts all forms
+        self.form = form
+        self.using = using
+        self.raise_error = raise_error
+
+        # the same SQL from the same field this many times is N+1
+        self.repeated = repeated
+        self.budgets = budgets
+
+        self.stack = list()
+        self.queries = list()
+        self.previous = None
+        self.wrapper = None
+
+    def scope(self, phase, form, field=None):
+        return _Scope(self, (phase, form, field.attribute if field is not None else None))
+
+    def matches(self):
+        if self.form is None:
+            return True
+
+        for _, form, _ in self.stack:
+            if form is self.form or (isinstance(self.form, type) and isinstance(form, self.form)):
+                return True
+
+        return False
+
+    def __call__(self, execute, sql, params, many, context):
+        if len(self.stack) > 0 and self.matches():
+            phase = self.stack[-1][0]
+            path = '.'.join(attribute for _, _, attribute in self.stack if attribute is not None)
+            self.queries.append((phase, path, self.in_list.sub('(%s...)', sql)))
+
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        from django.db import connections
+
+        self.previous = getattr(_local, 'guard', None)
+        _local.guard = self
+
+        self.wrapper = connections[self.using].execute_wrapper(self)
+        self.wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wrapper.__exit__(exc_type, exc_value, traceback)
+        _local.guard = self.previous
+
+        if exc_type is None:
+            self.check()
+
+        return False
+
+    def count(self, phase=None, path=None):
+        return len([q for q in self.queries
+                    if (phase is None or q[0] == phase) and (path is None or q[1] == path)])
+
+    def violations(self):
+        out = list()
+
+        for phase, budget in self.budgets.items():
+            count = self.count(phase)
+
+            if count > budget:
+                paths = Counter(path for p, path, _ in self.queries if p == phase)
+                details = ', '.join('%s: %d' % (path or '<form>', n) for path, n in paths.most_common())
+                out.append('%s used %d queries, budget is %d (%s)' % (phase, count, budget, details))
+
+        for (phase, path, sql), count in Counter(self.queries).items():
+            if count >= self.repeated:
+                out.append('N+1 in %s of %s: %d times %s' % (phase, path or '<form>', count, sql))
+
+        return out
+
+    def check(self):
+        violations = self.violations()
+
+        if len(violations) == 0:
+            return
+
+        if self.raise_error:
+            raise QueryBudgetExceeded('\n'.join(violations))
+
+        import logging
+        logger = logging.getLogger('forms.query_budget')
+
+        for violation in violations:
+            logger.warning(violation)
+
+
+query_budget = QueryBudget
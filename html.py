@@ -1,4 +1,6 @@
-from xml.sax.saxutils import escape, unescape
+def escape(data):
+    """ Same as xml.sax.saxutils.escape, which imports urllib, http and email modules on import """
+    return data.replace('&', '&amp;').replace('>', '&gt;').replace('<', '&lt;')
 
 
 class HtmlHelper(object):
@@ -23,7 +25,7 @@ class HtmlHelper(object):
         return escape(expression)
 
     @classmethod
-    def tag(cls, tag, content=None, attributes=None):
+    def render_attributes(cls, attributes=None):
         attributes = attributes or dict()
         joined_attributes = list()
 
@@ -37,9 +39,17 @@ class HtmlHelper(object):
             joined_attributes.append(case)
 
         if len(joined_attributes) > 0:
-            joined_attributes = ' ' + ' '.join(joined_attributes)
-        else:
-            joined_attributes = ''
+            return ' ' + ' '.join(joined_attributes)
+
+        return ''
+
+    @classmethod
+    def open_tag(cls, tag, attributes=None):
+        return "<%s%s>" % (tag, cls.render_attributes(attributes))
+
+    @classmethod
+    def tag(cls, tag, content=None, attributes=None):
+        joined_attributes = cls.render_attributes(attributes)
 
         if tag in cls.auto_close_tags:
             return "<%s%s/>" % (tag, joined_attributes)
@@ -51,15 +61,20 @@ class HtmlHelper(object):
     def div(cls, content=None, attributes=None):
         return cls.tag('div', content, attributes)
 
+    @staticmethod
+    def copy_attributes(attributes):
+        """ Helpers never change dict of caller, it may be shared by threads """
+        return dict(attributes) if attributes else dict()
+
     @classmethod
     def link(cls, label=None, href='#', attributes=None):
-        attributes = attributes or dict()
+        attributes = cls.copy_attributes(attributes)
         attributes['href'] = href
         return cls.tag('a', label, attributes)
 
     @classmethod
     def input(cls, name=None, value=None, attributes=None):
-        attributes = attributes or dict()
+        attributes = cls.copy_attributes(attributes)
 
         attributes.update({
             "name": name,
@@ -70,7 +85,7 @@ class HtmlHelper(object):
 
     @classmethod
     def textarea(cls, name=None, value=None, attributes=None):
-        attributes = attributes or dict()
+        attributes = cls.copy_attributes(attributes)
 
         attributes.update({
             "name": name,
@@ -91,7 +106,7 @@ class HtmlHelper(object):
             })
             render_options.append(option)
 
-        attributes = attributes or dict()
+        attributes = cls.copy_attributes(attributes)
 
         attributes.update({
             "name": name,
@@ -101,6 +116,6 @@ class HtmlHelper(object):
 
     @classmethod
     def img(cls, src, alt='', options=None):
-        options = options or dict()
+        options = cls.copy_attributes(options)
         options.update({'src': src, 'alt': alt})
         return cls.tag('img', None, options)
@@ -0,0 +1,176 @@
+"""
+Streaming import of CSV / JSON lines files through form classes. Records are validated
+by pooled forms, applied onto fresh model instances and inserted by bulk_create in chunks
+
+    importer = BulkImporter(JobForm, Job, columns={'Job name': 'name'}, chunk_size=1000)
+    result = importer.run(CsvSource(open('jobs.csv', newline='')))
+"""
+import csv
+import json
+
+from .forms import FormPool, NestedFormField, FormsetField, ManyToManyCheckBoxListField
+
+
+class CsvSource(object):
+    """ Records of csv file as dicts by header row, read lazily """
+
+    def __init__(self, file, **reader_kwargs):
+        self.file = file
+        self.reader_kwargs = reader_kwargs
+
+    def __iter__(self):
+        return iter(csv.DictReader(self.file, **self.reader_kwargs))
+
+
+class JsonLinesSource(object):
+    """ Records of file with one json object per line, blank lines are skipped """
+
+    def __init__(self, file):
+        self.file = file
+
+    def __iter__(self):
+        for line in self.file:
+            line = line.strip()
+
+            if line:
+                yield json.loads(line)
+
+
+class ListErrorSink(object):
+    """ Keeps invalid records in memory, suitable for small imports and tests """
+
+    def __init__(self):
+        self.errors = list()
+
+    def write(self, offset, record, errors):
+        self.errors.append((offset, record, errors))
+
+
+class JsonLinesErrorSink(object):
+    """ Writes invalid records with field errors to file, one json object per line """
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, offset, record, errors):
+        self.file.write(json.dumps({'offset': offset, 'record': record, 'errors': errors}, default=str))
+        self.file.write('\n')
+
+
+class FileCheckpoint(object):
+    """ Offset of next record to import stored in file, rewritten after each committed chunk """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def __call__(self, offset):
+        with open(self.path, 'w') as f:
+            f.write(str(offset))
+
+
+class ImportResult(object):
+    def __init__(self, offset=0):
+        self.imported = 0
+        self.failed = 0
+
+        # offset of next record, start of resumed import
+        self.offset = offset
+
+    def __repr__(self):
+        return '<ImportResult imported=%d failed=%d offset=%d>' % (self.imported, self.failed, self.offset)
+
+
+class BulkImporter(object):
+    """
+    Import records by form class without per-row save. Form hooks before_save, after_save
+    and after_commit are not called, relational fields (nested forms, formsets, many to many)
+    are not supported because bulk_create does not save them.
+
+    columns maps record keys to field names, unmapped keys are passed as is.
+    Every chunk is inserted in own transaction, then checkpoint(offset) is called
+    """
+
+    def __init__(self, form_class, model, columns=None, chunk_size=1000, error_sink=None,
+                 checkpoint=None, using=None, **form_kwargs):
+        for name, field in form_class.base_fields.items():
+            if isinstance(field, (NestedFormField, FormsetField, ManyToManyCheckBoxListField)):
+                raise ValueError('Field %s of %s can not be imported in bulk' % (name, form_class.__name__))
+
+        self.form_class = form_class
+        self.model = model
+        self.columns = columns or dict()
+        self.chunk_size = chunk_size
+        self.error_sink = error_sink if error_sink is not None else ListErrorSink()
+        self.checkpoint = checkpoint
+        self.using = using
+        self.pool = FormPool(form_class, **form_kwargs)
+
+    def map_record(self, record):
+        columns = self.columns
+        return {columns.get(key, key): value for key, value in record.items()}
+
+    def build(self, record):
+        """ Pair of validated instance and None, or None and field errors of invalid record """
+        with self.pool.form(self.model()) as form:
+            form.load_json(self.map_record(record))
+
+            if not form.is_valid():
+                return None, dict(form.errors)
+
+            for _, field in form.fields.items():
+                field.apply()
+
+            form.after_apply()
+            return form.instance, None
+
+    def flush(self, instances, result):
+        from django.db import router, transaction
+
+        using = self.using or router.db_for_write(self.model)
+
+        if len(instances) > 0:
+            with transaction.atomic(using=using):
+                self.model._default_manager.db_manager(using).bulk_create(instances)
+
+            result.imported += len(instances)
+
+        if self.checkpoint is not None:
+            self.checkpoint(result.offset)
+
+    def run(self, source, start=0):
+        """ Import records of source beginning at offset start, e.g. loaded checkpoint """
+        result = ImportResult(start)
+        chunk = list()
+        flushed = start
+
+        for offset, record in enumerate(source):
+            if offset < start:
+                continue
+
+            instance, errors = self.build(record)
+
+            if errors is None:
+                chunk.append(instance)
+            else:
+                result.failed += 1
+                self.error_sink.write(offset, record, errors)
+
+            result.offset = offset + 1
+
+            if len(chunk) >= self.chunk_size:
+                self.flush(chunk, result)
+                chunk = list()
+                flushed = result.offset
+
+        # tail of chunk or invalid records after last flush
+        if result.offset > flushed:
+            self.flush(chunk, result)
+
+        return result
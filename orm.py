@@ -0,0 +1,24 @@
+"""
+Django ORM adapter. Core modules (fields, validation, rendering) import it lazily,
+so forms without model instances do not load django at all
+"""
+from django.db.models import QuerySet
+from django.db.models.manager import Manager
+
+
+def get_related_instance(value, model):
+    """ Single related instance from value of relation attribute, new instance when there is none """
+    if isinstance(value, QuerySet):
+        try:
+            return value.get()
+        except model.DoesNotExist:
+            return model()
+
+    if isinstance(value, Manager):
+        instance = value.first()
+        return instance if instance is not None else model()
+
+    if value is None:
+        return model()
+
+    return value
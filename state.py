@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import json
+import zlib
+
+
+class BadStateToken(ValueError):
+    pass
+
+
+def get_signing_key(key=None):
+    if key is None:
+        from django.conf import settings
+        key = settings.SECRET_KEY
+
+    return key.encode() if isinstance(key, str) else key
+
+
+def _signature(key, payload):
+    return hmac.new(key, payload, hashlib.sha256).digest()[:16]
+
+
+def dumps(data, key=None):
+    """ Pack data to compact signed url-safe token: json -> zlib -> hmac -> base64 """
+    payload = json.dumps(data, separators=(',', ':'), default=str).encode()
+    payload = zlib.compress(payload, 6)
+    token = _signature(get_signing_key(key), payload) + payload
+
+    return base64.urlsafe_b64encode(token).rstrip(b'=').decode()
+
+
+def loads(token, key=None):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except (TypeError, ValueError):
+        raise BadStateToken('State token is malformed')
+
+    signature, payload = raw[:16], raw[16:]
+
+    if not hmac.compare_digest(signature, _signature(get_signing_key(key), payload)):
+        raise BadStateToken('State token signature mismatch')
+
+    try:
+        return json.loads(zlib.decompress(payload))
+    except (zlib.error, ValueError):
+        raise BadStateToken('State token is malformed')
+
+
+def make_instance(model, pk, values):
+    """
+    Build model instance from saved state without query. Instance fields not present in
+    values stay deferred so save() updates only restored columns
+    """
+    if pk is None:
+        return model()
+
+    from django.db import router
+
+    values = dict(values)
+    values[model._meta.pk.attname] = pk
+
+    names = list()
+    row = list()
+
+    # from_db expects values in order of concrete fields
+    for f in model._meta.concrete_fields:
+        if f.attname in values:
+            names.append(f.attname)
+            row.append(values[f.attname])
+
+    return model.from_db(router.db_for_write(model), names, row)
@@ -0,0 +1,104 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.db import transaction  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+commits = list()
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.Field()
+
+    def before_save(self):
+        if self.fields['name'].value == 'Fail':
+            raise RuntimeError('Row can not be saved')
+
+
+class ProjectForm(forms.Form):
+    name = forms.Field()
+    jobs = forms.FormsetField(form_class=JobForm)
+
+    def after_commit(self):
+        commits.append(self.instance.name)
+
+
+class SavepointProjectForm(ProjectForm):
+    use_savepoint = True
+
+
+@pytest.fixture
+def project():
+    commits.clear()
+    project = Project.objects.create(name='Project')
+    Job.objects.bulk_create([Job(project=project, name='Job %d' % i) for i in range(2)])
+    yield project
+    project.delete()
+
+
+def make_form(form_class, project, jobs):
+    data = {'name': 'Renamed'}
+
+    for i, name in enumerate(jobs):
+        data['jobs-%d-id' % i] = ''
+        data['jobs-%d-name' % i] = name
+
+    form = form_class(instance=Project.objects.get(pk=project.pk))
+    form.load(data)
+    return form
+
+
+def state(project):
+    project.refresh_from_db()
+    return project.name, sorted(project.jobs.values_list('name', flat=True))
+
+
+def test_atomic_save_rolls_back_whole_tree(project):
+    with pytest.raises(RuntimeError):
+        make_form(ProjectForm, project, ['New', 'Fail']).save(atomic=True)
+
+    assert state(project) == ('Project', ['Job 0', 'Job 1'])
+    assert commits == []
+
+
+def test_save_without_transaction_keeps_rows_saved_before_error(project):
+    with pytest.raises(RuntimeError):
+        make_form(ProjectForm, project, ['New', 'Fail']).save()
+
+    assert state(project)[0] == 'Renamed'
+
+
+def test_savepoint_rolls_back_only_form_inside_outer_transaction(project):
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(description='Outer')
+
+        with pytest.raises(RuntimeError):
+            make_form(SavepointProjectForm, project, ['New', 'Fail']).save()
+
+    assert state(project) == ('Project', ['Job 0', 'Job 1'])
+    assert project.description == 'Outer'
+
+
+def test_after_commit_runs_when_outer_transaction_commits(project):
+    with transaction.atomic():
+        make_form(ProjectForm, project, ['New']).save(atomic=True)
+        assert commits == []
+
+    assert commits == ['Renamed']
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            make_form(ProjectForm, project, ['Other']).save()
+            raise RuntimeError('Outer transaction fails')
+
+    assert commits == ['Renamed']
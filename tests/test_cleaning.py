@@ -0,0 +1,118 @@
+import datetime
+import decimal
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+from forms.benchmarks.cases import ProjectForm, make_project  # noqa: E402
+
+
+class CountingIntegerField(forms.IntegerField):
+    calls = 0
+
+    def to_python(self, value):
+        CountingIntegerField.calls += 1
+        return super(CountingIntegerField, self).to_python(value)
+
+
+class OrderForm(forms.Form):
+    quantity = CountingIntegerField(required=True)
+    price = forms.DecimalField()
+    delivery = forms.DateField()
+    gift = forms.CheckBoxField()
+
+
+def make_order():
+    order = DynamicObject()
+    order.quantity = 3
+    order.price = decimal.Decimal('9.50')
+    order.delivery = datetime.date(2026, 1, 1)
+    order.gift = False
+    return order
+
+
+def test_values_are_parsed_once_and_reused():
+    form = OrderForm(instance=make_order())
+    form.load({'quantity': '3', 'price': '10.25', 'delivery': '2026-02-01', 'gift': '1'})
+    CountingIntegerField.calls = 0
+
+    assert form.is_valid()
+    assert form.cleaned_data == {'quantity': 3, 'price': decimal.Decimal('10.25'),
+                                 'delivery': datetime.date(2026, 2, 1), 'gift': True}
+    assert not form.fields['quantity'].has_changed()
+    assert form.to_dict()['delivery'] == datetime.date(2026, 2, 1)
+
+    form.save()
+
+    assert form.instance.quantity == 3 and form.instance.gift is True
+    assert CountingIntegerField.calls == 1
+    assert 'checked' in form.fields['gift'].render_control()
+
+
+def test_unparsable_values_keep_raw_value_and_messages():
+    form = OrderForm(instance=make_order())
+    form.load({'quantity': 'many', 'price': '1,5', 'delivery': 'tomorrow', 'gift': '0'})
+
+    assert not form.is_valid()
+    assert form.errors == {
+        'quantity': ['Value of quantity must be numerical'],
+        'price': ['Value of price must be a number'],
+        'delivery': ['Value of delivery must be a date'],
+    }
+    assert form.cleaned_data == {'gift': False}
+    assert 'value="many"' in form.fields['quantity'].render_control()
+
+
+def test_json_values_of_wrong_type_are_errors():
+    form = OrderForm(instance=make_order())
+    form.load_json({'quantity': [3], 'price': {'value': 1}, 'delivery': 20240101, 'gift': False})
+
+    assert not form.is_valid()
+    assert form.errors == {
+        'quantity': ['Value of quantity must be numerical'],
+        'price': ['Value of price must be a number'],
+        'delivery': ['Value of delivery must be a date'],
+    }
+
+
+@pytest.mark.parametrize('quantity, price', [
+    (2.7, 'NaN'),
+    (True, 'Infinity'),
+    ('1_000', '1e400'),
+    ('٣', float('inf')),
+    (False, True),
+])
+def test_values_rejected_by_client_rules_are_errors(quantity, price):
+    form = OrderForm(instance=make_order())
+    form.load_json({'quantity': quantity, 'price': price})
+
+    assert not form.is_valid()
+    assert set(form.errors) == {'quantity', 'price'}
+
+
+def test_integral_numbers_are_accepted():
+    form = OrderForm(instance=make_order())
+    form.load_json({'quantity': 2.0, 'price': 1.5})
+
+    assert form.is_valid()
+    assert form.cleaned_data['quantity'] == 2
+    assert form.cleaned_data['price'] == decimal.Decimal('1.5')
+
+
+def test_many_to_many_ids_are_typed():
+    project = make_project(1)
+    form = ProjectForm(instance=project)
+    tags = form.fields['tags']
+
+    tags.set_loaded_value([str(pk) for pk in tags.value])
+
+    assert tags.cleaned_value == tags.old_value
+    assert not tags.has_changed()
@@ -0,0 +1,63 @@
+import json
+import re
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.cases import ProjectForm, make_project, make_projects  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+
+
+class AgreementForm(forms.Form):
+    id = forms.HiddenIdField(required=True)
+    name = forms.TextField(required=True)
+    agree = forms.CheckBoxField(required=True)
+    tags = forms.CheckBoxListField(required=True, options=[(1, 'One')])
+
+
+def test_rules_are_rendered_as_attributes_except_row_template():
+    form = ProjectForm(instance=make_project(2))
+    jobs = form.fields['jobs']
+
+    assert form.fields['name'].collect_attributes()['required'] is True
+    assert jobs.forms['0'].fields['name'].collect_attributes()['maxlength'] == 100
+    assert jobs.forms['0'].fields['hours'].collect_attributes()['inputmode'] == 'numeric'
+    assert 'required' not in jobs.hidden_form.fields['name'].collect_attributes()
+
+
+def test_client_rules_match_server_messages():
+    form = ProjectForm(instance=make_project(2))
+    pairs = dict(form.collect_client_rules())
+    row_rules = json.loads(pairs[r'jobs\-\d+\-'])
+
+    assert json.loads(pairs[''])['name'] == [{'rule': 'required', 'message': 'Field name is required'}]
+    assert row_rules['name'][1] == {'rule': 'max_length', 'message': 'Maximum length of name is 100', 'value': 100}
+    assert form.get_client_rules() is form.get_client_rules()
+    assert r'jobs\\-\\d+\\-' in form.js
+
+
+def test_checkbox_hidden_and_multi_value_controls_have_no_rules():
+    form = AgreementForm(instance=DynamicObject())
+    rules = json.loads(form.get_client_rules())
+
+    assert list(rules) == ['name']
+    assert 'required' not in form.fields['agree'].render_control()
+    assert form.fields['tags'].get_rule_attributes() == {}
+    assert 'required' not in form.fields['id'].render_control()
+
+
+def test_validation_handler_is_scoped_to_form_and_emitted_once():
+    form = ProjectForm(instance=make_project(2))
+
+    assert "$(document).on('submit'" not in form.js
+    assert '"name");' in form.js
+
+    grid = forms.FormGrid(ProjectForm, make_projects(3))
+
+    assert grid.js.count('function failed(') == 1
+    assert len(set(re.findall(r'grid\\\\-\d+\\\\-', grid.js))) == 3
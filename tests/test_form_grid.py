@@ -0,0 +1,105 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.cases import ProjectForm, make_project  # noqa: E402
+from forms.benchmarks.models import Project, Job, Ticket  # noqa: E402
+
+
+class JobRowForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.TextField(required=True)
+    hours = forms.IntegerField()
+
+
+class TicketRowForm(forms.Form):
+    title = forms.TextField(required=True)
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+
+    return len(context.captured_queries)
+
+
+def test_queries_do_not_grow_with_rows():
+    for _ in range(6):
+        make_project(3)
+
+    few = count_queries(lambda: forms.FormGrid(ProjectForm, Project.objects.all()[:2]))
+    many = count_queries(lambda: forms.FormGrid(ProjectForm, Project.objects.all()[:6]))
+
+    assert few == many
+
+
+def test_changed_rows_are_saved_by_one_bulk_update():
+    project = make_project(5)
+    grid = forms.FormGrid(JobRowForm, project.jobs.order_by('pk'), prefix='jobs')
+    first, second = [job.pk for job in project.jobs.order_by('pk')[:2]]
+
+    grid.load({
+        'jobs-%d-name' % first: 'Renamed',
+        'jobs-%d-hours' % first: '12',
+        'jobs-%d-name' % second: 'Job 1',
+        'jobs-%d-hours' % second: 'many',
+    })
+
+    assert not grid.is_valid()
+    assert list(grid.errors) == [str(second)]
+
+    grid.forms[str(second)].errors.clear()
+    grid.forms[str(second)].fields['hours'].value = 1
+
+    with CaptureQueriesContext(connection) as context:
+        assert grid.save() == 1
+
+    updates = [q for q in context.captured_queries if q['sql'].startswith('UPDATE')]
+    assert len(updates) == 1
+    assert Job.objects.get(pk=first).name == 'Renamed'
+    assert Job.objects.get(pk=first).hours == 12
+    assert '<table class="table form-grid"><tbody><tr>' in grid.render()
+
+
+def test_rows_of_model_with_save_signals_are_saved_one_by_one():
+    from django.db.models.signals import post_save
+
+    project = make_project(5)
+    saved = list()
+
+    def receiver(sender, instance, **kwargs):
+        saved.append(instance.pk)
+
+    post_save.connect(receiver, sender=Job, dispatch_uid='test_form_grid')
+
+    try:
+        grid = forms.FormGrid(JobRowForm, project.jobs.order_by('pk'), prefix='jobs')
+        pks = [job.pk for job in project.jobs.order_by('pk')[:2]]
+        grid.load({'jobs-%d-name' % pk: 'Signal %d' % pk for pk in pks})
+
+        assert grid.save() == 2
+    finally:
+        post_save.disconnect(dispatch_uid='test_form_grid', sender=Job)
+
+    assert saved == pks
+    assert Job.objects.get(pk=pks[0]).name == 'Signal %d' % pks[0]
+
+
+def test_rows_with_uuid_primary_key_are_loaded_and_saved():
+    tickets = [Ticket.objects.create(title='Ticket %d' % i) for i in range(3)]
+    grid = forms.FormGrid(TicketRowForm, Ticket.objects.filter(pk__in=[t.pk for t in tickets]))
+
+    grid.load({'grid-%s-title' % tickets[1].pk: 'Edited'})
+
+    assert grid.is_valid()
+    assert grid.save() == 1
+    assert Ticket.objects.get(pk=tickets[1].pk).title == 'Edited'
+    assert Ticket.objects.get(pk=tickets[0].pk).title == 'Ticket 0'
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.TextField(required=True)
+
+
+class ProjectForm(forms.Form):
+    name = forms.TextField(required=True)
+    jobs = forms.FormsetField(form_class=JobForm)
+
+
+class ContactForm(forms.Form):
+    name = forms.TextField(required=True)
+    age = forms.IntegerField()
+
+
+@pytest.fixture
+def projects():
+    projects = list()
+
+    for name in ('First', 'Second'):
+        project = Project.objects.create(name=name)
+        Job.objects.bulk_create([Job(project=project, name='%s %d' % (name, i)) for i in range(3)])
+        projects.append(project)
+
+    yield projects
+    [p.delete() for p in projects]
+
+
+def child_forms(form):
+    field = form.fields['jobs']
+    return {id(f) for f in field.forms.values()} | {id(field.hidden_form)}
+
+
+def test_rebind_reuses_child_forms(projects):
+    form = ProjectForm(instance=projects[0])
+    children = child_forms(form)
+
+    form.rebind(projects[1])
+
+    assert child_forms(form) == children
+    assert [f.fields['name'].value for f in form.fields['jobs'].forms.values()] == \
+        ['Second 0', 'Second 1', 'Second 2']
+    assert form.fields['jobs'].hidden_form.html_validation is False
+
+
+def test_rebind_resets_errors_of_form_and_child_forms(projects):
+    form = ProjectForm(instance=projects[0])
+    form.load({'name': '', 'jobs-0-id': '', 'jobs-0-name': ''})
+    row = form.fields['jobs'].forms['0']
+
+    assert not form.is_valid()
+    assert not row.is_valid()
+
+    form.rebind(projects[1])
+
+    assert form.errors == {}
+    assert all(f.errors == {} for f in form.fields['jobs'].forms.values())
+    assert form.fields['name'].value == 'Second'
+
+
+def test_pool_rebinds_released_form():
+    pool = forms.FormPool(ContactForm)
+
+    with pool.form(DynamicObject(), {'name': '', 'age': 'x'}) as form:
+        assert not form.is_valid()
+
+    with pool.form(DynamicObject(), {'name': 'Name', 'age': '3'}) as again:
+        assert again is form
+        assert again.errors == {}
+        assert again.is_valid()
+        assert again.cleaned_data == {'name': 'Name', 'age': 3}
+
+    # forms in use are not shared
+    first = pool.acquire(DynamicObject())
+    second = pool.acquire(DynamicObject())
+    assert first is not second
@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.Field()
+
+
+class ProjectForm(forms.Form):
+    name = forms.Field()
+    jobs = forms.FormsetField(form_class=JobForm, window=2)
+
+
+@pytest.fixture
+def jobs():
+    project = Project.objects.create(name='Project')
+    Job.objects.bulk_create([Job(project=project, name='Job %d' % i) for i in range(5)])
+    yield list(project.jobs.order_by('pk'))
+    project.delete()
+
+
+def names(project):
+    return list(project.jobs.order_by('pk').values_list('name', flat=True))
+
+
+def page_2(jobs, rows):
+    data = {'name': 'Project', 'jobs-cursor': str(jobs[1].pk)}
+
+    for i, (pk, name) in enumerate(rows):
+        data['jobs-%d-id' % i] = str(pk or '')
+        data['jobs-%d-name' % i] = name
+
+    return data
+
+
+def test_get_page_by_cursor(jobs):
+    form = ProjectForm(instance=jobs[0].project, data={'jobs-cursor': str(jobs[1].pk)})
+    field = form.fields['jobs']
+
+    assert [f.instance.pk for f in field.forms.values()] == [jobs[2].pk, jobs[3].pk]
+    assert field.next_cursor == jobs[3].pk
+    assert 'name="jobs-cursor" value="%d"' % jobs[1].pk in form.render()
+
+
+def test_post_page_updates_rows_of_page(jobs):
+    project = jobs[0].project
+    form = ProjectForm(instance=project)
+    form.load(page_2(jobs, [(jobs[2].pk, 'EDIT2'), (jobs[3].pk, 'EDIT3')]))
+
+    assert form.is_valid()
+    form.save()
+
+    assert names(project) == ['Job 0', 'Job 1', 'EDIT2', 'EDIT3', 'Job 4']
+
+
+def test_rows_missing_in_page_are_deleted_only_inside_window(jobs):
+    project = jobs[0].project
+    form = ProjectForm(instance=project)
+    form.load(page_2(jobs, [(jobs[3].pk, 'EDIT3'), (None, 'New')]))
+
+    assert form.is_valid()
+    form.save()
+
+    assert names(project) == ['Job 0', 'Job 1', 'EDIT3', 'Job 4', 'New']
+
+
+def test_rows_outside_window_are_refused(jobs):
+    project = jobs[0].project
+    form = ProjectForm(instance=project)
+    form.load(page_2(jobs, [(jobs[0].pk, 'EDIT0'), (jobs[2].pk, 'EDIT2')]))
+
+    assert not form.is_valid()
+    assert 'jobs' in form.errors
+    assert names(project) == ['Job 0', 'Job 1', 'Job 2', 'Job 3', 'Job 4']
@@ -0,0 +1,65 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Address, Company  # noqa: E402
+
+
+class AddressForm(forms.Form):
+    city = forms.Field()
+
+
+class CompanyForm(forms.Form):
+    name = forms.Field()
+    address = forms.NestedFormField(form_class=AddressForm)
+    billing_address = forms.NestedFormField(form_class=AddressForm)
+
+
+class BatchCompanyForm(CompanyForm):
+    batch_save = True
+
+
+def create(form_class):
+    form = form_class(instance=Company())
+    # nested forms share prefix '-'
+    form.load({'name': 'Company', '-city': 'Riga'})
+    form.save()
+
+    return Company.objects.get(pk=form.instance.pk)
+
+
+def test_new_host_with_not_null_forward_relation():
+    for form_class in (CompanyForm, BatchCompanyForm):
+        company = create(form_class)
+
+        assert company.address.city == 'Riga'
+        assert company.billing_address.city == 'Riga'
+        assert company.address_id != company.billing_address_id
+
+
+def test_nested_instance_of_existing_host_is_updated():
+    company = create(CompanyForm)
+    address_pk = company.address_id
+
+    form = CompanyForm(instance=company)
+    form.load({'name': 'Company', '-city': 'Tallinn'})
+    form.save()
+
+    company.refresh_from_db()
+    assert company.address_id == address_pk
+    assert company.address.city == 'Tallinn'
+
+
+def test_patch_creates_nested_instance_of_null_relation():
+    company = Company.objects.create(name='Company', address=Address.objects.create(city='Riga'))
+
+    form = CompanyForm(instance=Company.objects.get(pk=company.pk))
+    assert form.apply_patch([{'op': 'replace', 'path': '/billing_address/city', 'value': 'Oslo'}])
+
+    company.refresh_from_db()
+    assert company.billing_address.city == 'Oslo'
@@ -0,0 +1,63 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.fragments import LRUCache, FileSystemCache  # noqa: E402
+from forms.benchmarks.cases import JobForm, ProjectForm, make_project  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+
+class CountingCache(LRUCache):
+    def __init__(self, *args, **kwargs):
+        super(CountingCache, self).__init__(*args, **kwargs)
+        self.misses = 0
+
+    def set(self, key, value):
+        self.misses += 1
+        super(CountingCache, self).set(key, value)
+
+
+class CachedJobForm(JobForm):
+    fragment_cache = CountingCache()
+
+
+class CachedProjectForm(ProjectForm):
+    jobs = forms.FormsetField(form_class=CachedJobForm)
+
+
+def test_unchanged_rows_are_served_from_cache():
+    project = make_project(4)
+    expected = ProjectForm(instance=project).render()
+
+    assert CachedProjectForm(instance=project).render() == expected
+    # four rows and hidden row template
+    assert CachedJobForm.fragment_cache.misses == 5
+
+    job = project.jobs.order_by('pk').first()
+    Job.objects.filter(pk=job.pk).update(name='Changed')
+
+    html = CachedProjectForm(instance=Project.objects.get(pk=project.pk)).render()
+
+    assert 'value="Changed"' in html
+    assert CachedJobForm.fragment_cache.misses == 6
+
+
+def test_changed_form_is_not_cached_and_etag_follows_state(tmp_path):
+    project = make_project(4)
+    form = CachedProjectForm(instance=project)
+    etag = form.etag
+
+    assert etag == CachedProjectForm(instance=project).etag
+
+    form.fields['jobs'].forms['0'].fields['name'].value = 'Typed'
+    assert form.etag is None
+
+    cache = FileSystemCache(str(tmp_path))
+    cache.set('key', 'fragment')
+    assert cache.get('key') == 'fragment'
+    assert cache.get('missing') is None
@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.cases import JobForm, ProjectForm, make_project, make_post  # noqa: E402
+from forms.benchmarks.models import Project  # noqa: E402
+
+
+class LimitedProjectForm(ProjectForm):
+    max_post_keys = 500
+    max_child_forms = 30
+
+    jobs = forms.FormsetField(form_class=JobForm, max_rows=20)
+
+
+def test_too_many_rows_are_rejected_before_forms_are_built():
+    form = LimitedProjectForm(instance=make_project(3))
+    data = make_post(21)
+
+    form.load(data)
+
+    assert len(form.fields['jobs'].forms) == 3
+    assert form.errors['jobs'] == ['Maximum number of rows of jobs is 20']
+    assert not form.is_valid()
+
+    form = LimitedProjectForm(instance=make_project(3))
+    form.load_json({'name': 'Project', 'jobs': [{'name': 'Job', 'hours': 1}] * 21})
+    assert len(form.fields['jobs'].forms) == 3
+    assert 'jobs' in form.errors
+
+
+def test_too_many_keys_and_child_forms():
+    form = LimitedProjectForm(instance=Project())
+    form.load(dict(('key-%d' % i, '') for i in range(501)))
+
+    assert form.errors == {forms.NON_FIELD_ERRORS: ['Submission has too many fields']}
+
+    class FewFormsProjectForm(LimitedProjectForm):
+        max_child_forms = 10
+
+    form = FewFormsProjectForm(instance=Project())
+    form.load(make_post(11))
+
+    assert form.errors['jobs'] == ['Submission has too many rows']
+    assert len(form.fields['jobs'].forms) == 0
+
+
+def test_nesting_depth():
+    class ShallowProjectForm(ProjectForm):
+        max_depth = 0
+
+    form = ShallowProjectForm(instance=Project())
+    form.load(make_post(2))
+
+    assert form.errors['jobs'] == ['Rows of jobs are nested too deep']
+
+    form = ProjectForm(instance=Project())
+    form.load(make_post(2))
+    assert form.is_valid()
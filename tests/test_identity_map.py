@@ -0,0 +1,100 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Address, Company  # noqa: E402
+
+
+class AddressForm(forms.Form):
+    city = forms.Field()
+
+
+class CompanyRowForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.Field()
+    billing_address = forms.NestedFormField(form_class=AddressForm)
+
+
+class HomeForm(forms.Form):
+    city = forms.Field()
+    companies = forms.FormsetField(form_class=CompanyRowForm)
+
+
+class BatchHomeForm(HomeForm):
+    batch_save = True
+
+
+@pytest.fixture
+def home():
+    home = Address.objects.create(city='Home')
+    shared = Address.objects.create(city='shared')
+    Company.objects.bulk_create([Company(name='Company %d' % i, address=home, billing_address=shared)
+                                 for i in range(4)])
+    yield Address.objects.get(pk=home.pk)
+    Company.objects.filter(address=home).delete()
+    home.delete()
+    shared.delete()
+
+
+def make_data(home, cities):
+    data = {'city': 'Home'}
+
+    for i, (company, city) in enumerate(zip(home.companies.order_by('pk'), cities)):
+        data['companies-%d-id' % i] = str(company.pk)
+        data['companies-%d-name' % i] = company.name
+        data['companies-%d--city' % i] = city
+
+    return data
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+
+    return context.captured_queries
+
+
+def test_rows_share_instance_loaded_by_one_query(home):
+    queries = count_queries(lambda: HomeForm(instance=home))
+    selects = [q['sql'] for q in queries if 'FROM "benchmarks_address"' in q['sql']]
+
+    assert len(selects) == 1
+
+    form = HomeForm(instance=home)
+    addresses = {id(f.fields['billing_address'].nested_form.instance)
+                 for f in form.fields['companies'].forms.values()}
+    assert len(addresses) == 1
+
+
+def test_shared_instance_is_saved_once(home):
+    form = HomeForm(instance=home)
+    form.load(make_data(home, ['shared'] * 4))
+
+    queries = count_queries(form.save)
+    updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "benchmarks_address"')]
+
+    # home and shared billing address
+    assert len(updates) == 2
+
+
+@pytest.mark.parametrize('form_class', [HomeForm, BatchHomeForm])
+@pytest.mark.parametrize('cities, saved', [
+    (['shared', 'EDITED', 'shared', 'shared'], 'shared'),
+    (['shared', 'shared', 'shared', 'EDITED'], 'EDITED'),
+])
+def test_last_submitted_values_of_shared_instance_win(home, form_class, cities, saved):
+    form = form_class(instance=home)
+    form.load(make_data(home, cities))
+    form.save()
+
+    assert set(Company.objects.filter(address=home).values_list('billing_address__city', flat=True)) == {saved}
@@ -0,0 +1,64 @@
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.importer import BulkImporter, CsvSource, JsonLinesSource  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+
+class JobImportForm(forms.Form):
+    project_id = forms.IntegerField(required=True)
+    name = forms.TextField(required=True, max_length=100)
+    hours = forms.IntegerField()
+
+
+def make_csv(project, rows, invalid_every=0):
+    lines = ['Project,Job name,hours']
+
+    for i in range(rows):
+        hours = 'many' if invalid_every and i % invalid_every == 0 else str(i % 40)
+        lines.append('%d,Job %d,%s' % (project.pk, i, hours))
+
+    return io.StringIO('\n'.join(lines) + '\n')
+
+
+def test_import_csv_in_chunks_with_errors():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    project = Project.objects.create(name='Import')
+    checkpoints = list()
+    importer = BulkImporter(JobImportForm, Job, columns={'Project': 'project_id', 'Job name': 'name'},
+                            chunk_size=10, checkpoint=checkpoints.append)
+
+    with CaptureQueriesContext(connection) as context:
+        result = importer.run(CsvSource(make_csv(project, 35, invalid_every=7)))
+
+    inserts = [q for q in context.captured_queries if q['sql'].startswith('INSERT')]
+
+    assert (result.imported, result.failed, result.offset) == (30, 5, 35)
+    assert len(inserts) == 3
+    assert checkpoints == [12, 24, 35]
+    assert project.jobs.count() == 30
+    assert project.jobs.get(name='Job 1').hours == 1
+
+    offset, record, errors = importer.error_sink.errors[0]
+    assert offset == 0 and record['hours'] == 'many'
+    assert errors == {'hours': ['Value of hours must be numerical']}
+
+
+def test_resume_from_checkpoint():
+    project = Project.objects.create(name='Resume')
+    source = '\n'.join('{"project_id": %d, "name": "Job %d", "hours": %d}' % (project.pk, i, i)
+                       for i in range(20))
+
+    result = BulkImporter(JobImportForm, Job, chunk_size=8).run(JsonLinesSource(io.StringIO(source)), start=12)
+
+    assert (result.imported, result.offset) == (8, 20)
+    assert sorted(project.jobs.values_list('hours', flat=True)) == list(range(12, 20))
@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Profile, Job  # noqa: E402
+
+
+class ProfileForm(forms.Form):
+    title = forms.Field()
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.TextField(required=True)
+    hours = forms.IntegerField()
+
+
+class ProjectForm(forms.Form):
+    name = forms.TextField(required=True)
+    profile = forms.NestedFormField(form_class=ProfileForm)
+    jobs = forms.FormsetField(form_class=JobForm)
+
+
+class JobWithoutIdForm(forms.Form):
+    name = forms.TextField(required=True)
+
+
+class ProjectWithoutIdsForm(forms.Form):
+    name = forms.TextField(required=True)
+    jobs = forms.FormsetField(form_class=JobWithoutIdForm)
+
+
+@pytest.fixture
+def project():
+    project = Project.objects.create(name='Project')
+    Profile.objects.create(project=project, title='Profile')
+    Job.objects.bulk_create([Job(project=project, name='Job %d' % i, hours=i) for i in range(3)])
+    yield Project.objects.get(pk=project.pk)
+    project.delete()
+
+
+def make_form(project):
+    return ProjectForm(instance=Project.objects.get(pk=project.pk))
+
+
+def test_to_dict_round_trip(project):
+    data = json.loads(json.dumps(make_form(project).to_dict()))
+
+    assert data['profile'] == {'title': 'Profile'}
+    assert [row['name'] for row in data['jobs']] == ['Job 0', 'Job 1', 'Job 2']
+
+    form = make_form(project)
+    form.load_json(data)
+
+    assert form.is_valid()
+    assert form.to_dict() == data
+
+    form.save()
+    assert list(project.jobs.order_by('pk').values_list('name', 'hours')) == [('Job %d' % i, i) for i in range(3)]
+
+
+def test_rows_are_matched_by_pk_and_missing_rows_deleted(project):
+    data = make_form(project).to_dict()
+    jobs = data['jobs']
+
+    data['profile']['title'] = 'Changed'
+    jobs[2]['name'] = 'Last'
+    data['jobs'] = [jobs[2], jobs[0], {'name': 'New', 'hours': 7}]
+
+    form = make_form(project)
+    forms_by_pk = {f.instance.pk: f for f in form.fields['jobs'].forms.values()}
+    form.load_json(data)
+
+    assert form.fields['jobs'].forms['0'] is forms_by_pk[jobs[2]['id']]
+    assert form.is_valid()
+    form.save()
+
+    project.profile.refresh_from_db()
+    assert project.profile.title == 'Changed'
+    assert list(project.jobs.order_by('pk').values_list('name', 'hours')) == [
+        ('Job 0', 0), ('Last', 2), ('New', 7)]
+
+
+def test_round_trip_keeps_rows_of_form_without_id_field(project):
+    pks = list(project.jobs.order_by('pk').values_list('pk', flat=True))
+    data = json.loads(json.dumps(ProjectWithoutIdsForm(instance=project).to_dict()))
+
+    assert [row['id'] for row in data['jobs']] == pks
+
+    data['jobs'][1]['name'] = 'Edited'
+    form = ProjectWithoutIdsForm(instance=Project.objects.get(pk=project.pk))
+    form.load_json(data)
+
+    assert form.is_valid()
+    form.save()
+
+    assert list(project.jobs.order_by('pk').values_list('pk', 'name')) == [
+        (pks[0], 'Job 0'), (pks[1], 'Edited'), (pks[2], 'Job 2')]
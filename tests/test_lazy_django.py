@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CODE = '''
+import sys
+from forms import forms
+from forms.model import DynamicObject
+
+
+class PersonForm(forms.Form):
+    name = forms.TextField(required=True, max_length=20)
+    age = forms.IntegerField()
+
+
+form = PersonForm(instance=DynamicObject())
+form.load({'name': 'Ann', 'age': '30'})
+assert form.is_valid()
+form.save()
+form.render()
+
+print(len([m for m in sys.modules if m.startswith('django')]))
+'''
+
+
+def test_core_works_without_loading_django():
+    result = subprocess.run([sys.executable, '-c', CODE], env=dict(os.environ, PYTHONPATH=ROOT),
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == '0'
@@ -0,0 +1,135 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+
+class UpperField(forms.Field):
+    def validate(self):
+        if self.cleaned_value != (self.cleaned_value or '').upper():
+            raise forms.ValidationError('%s must be upper case' % self.label)
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.TextField(required=True)
+    hours = forms.IntegerField()
+
+
+class ProjectForm(forms.Form):
+    name = UpperField()
+    description = forms.TextAreaField()
+    jobs = forms.FormsetField(form_class=JobForm)
+
+    def custom_validation(self):
+        if self.fields['description'].cleaned_value == 'forbidden':
+            self.add_field_error('description', 'Description is forbidden')
+
+
+@pytest.fixture
+def project():
+    project = Project.objects.create(name='PROJECT', description='Description')
+    Job.objects.bulk_create([Job(project=project, name='Job %d' % i) for i in range(3)])
+    yield project
+    project.delete()
+
+
+def make_form(project):
+    return ProjectForm(instance=Project.objects.get(pk=project.pk))
+
+
+def test_replace_updates_only_touched_columns(project):
+    form = make_form(project)
+
+    with CaptureQueriesContext(connection) as context:
+        assert form.apply_patch([{'op': 'replace', 'path': '/description', 'value': 'New'}])
+
+    updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE')]
+    assert len(updates) == 1
+    assert '"description"' in updates[0] and '"name"' not in updates[0]
+
+    project.refresh_from_db()
+    assert project.description == 'New'
+
+
+def test_custom_validate_of_touched_field(project):
+    form = make_form(project)
+
+    assert not form.apply_patch([{'op': 'replace', 'path': '/name', 'value': 'lower'}])
+    assert form.errors['name'] == ['name must be upper case']
+
+    project.refresh_from_db()
+    assert project.name == 'PROJECT'
+
+
+def test_custom_validation_of_touched_form(project):
+    form = make_form(project)
+
+    assert not form.apply_patch([{'op': 'replace', 'path': '/description', 'value': 'forbidden'}])
+    assert form.errors['description'] == ['Description is forbidden']
+
+
+def test_rows_are_added_replaced_and_removed(project):
+    form = make_form(project)
+
+    assert form.apply_patch([
+        {'op': 'replace', 'path': '/jobs/1/name', 'value': 'Renamed'},
+        {'op': 'remove', 'path': '/jobs/0'},
+        {'op': 'add', 'path': '/jobs/-', 'value': {'name': 'Added', 'hours': 3}},
+    ])
+
+    assert list(project.jobs.order_by('pk').values_list('name', 'hours')) == [
+        ('Renamed', 0), ('Job 2', 0), ('Added', 3)]
+
+
+def test_invalid_new_row_is_not_saved(project):
+    form = make_form(project)
+
+    assert not form.apply_patch([{'op': 'add', 'path': '/jobs/-', 'value': {'hours': 1}}])
+    assert project.jobs.count() == 3
+
+
+@pytest.mark.parametrize('op', [
+    {'op': 'move', 'path': '/name'},
+    {'op': 'replace', 'path': 'name', 'value': 'X'},
+    {'op': 'replace', 'path': '/missing', 'value': 'X'},
+    {'op': 'replace', 'path': '/name/member', 'value': 'X'},
+    {'op': 'replace', 'path': '/jobs', 'value': []},
+    {'op': 'replace', 'path': '/jobs/7/name', 'value': 'X'},
+    {'op': 'add', 'path': '/jobs/1', 'value': {}},
+    {'op': 'replace', 'path': '/jobs/0/id', 'value': 12345},
+])
+def test_patch_errors(project, op):
+    with pytest.raises(forms.PatchError):
+        make_form(project).apply_patch([op])
+
+
+def test_added_rows_follow_limits_of_form_tree(project):
+    class FewFormsProjectForm(ProjectForm):
+        max_child_forms = 2
+
+    class ShallowProjectForm(ProjectForm):
+        max_depth = 0
+
+    add = {'op': 'add', 'path': '/jobs/-', 'value': {'name': 'Added'}}
+    form = FewFormsProjectForm(instance=Project.objects.get(pk=project.pk))
+
+    with pytest.raises(forms.PatchError, match='too many rows'):
+        form.apply_patch([add, add, add])
+
+    with pytest.raises(forms.PatchError, match='nested too deep'):
+        ShallowProjectForm(instance=Project.objects.get(pk=project.pk)).apply_patch([add])
+
+    assert project.jobs.count() == 3
+    assert FewFormsProjectForm(instance=Project.objects.get(pk=project.pk)).apply_patch([add, add])
@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job, Tag  # noqa: E402
+
+
+class TagLookupField(forms.Field):
+    """ Field which queries on every fetch, N+1 in formset rows """
+
+    def fetch(self):
+        self.value = Tag.objects.filter(name=self.instance.name).first()
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.Field()
+
+
+class LookupJobForm(JobForm):
+    tag = TagLookupField(apply=False)
+
+
+class ProjectForm(forms.Form):
+    name = forms.Field()
+    jobs = forms.FormsetField(form_class=JobForm)
+
+
+class LookupProjectForm(ProjectForm):
+    jobs = forms.FormsetField(form_class=LookupJobForm)
+
+
+@pytest.fixture
+def project():
+    project = Project.objects.create(name='Project')
+    Job.objects.bulk_create([Job(project=project, name='Job %d' % i) for i in range(5)])
+    yield project
+    project.delete()
+
+
+def test_fetch_and_save_within_budget(project):
+    data = {'name': 'New'}
+    for i, job in enumerate(project.jobs.order_by('pk')):
+        data['jobs-%d-id' % i] = str(job.pk)
+        data['jobs-%d-name' % i] = 'Job'
+
+    with forms.query_budget(ProjectForm, fetch=1, save=7, repeated=6) as budget:
+        form = ProjectForm(instance=project)
+        form.load(data)
+        form.save()
+
+    assert budget.count('fetch', 'jobs') == 1
+    assert budget.count('save', 'jobs') == 6
+
+
+def test_budget_exceeded_reports_field_path(project):
+    with pytest.raises(forms.QueryBudgetExceeded) as error:
+        with forms.query_budget(ProjectForm, fetch=0):
+            ProjectForm(instance=project)
+
+    assert 'fetch used 1 queries, budget is 0 (jobs: 1)' in str(error.value)
+
+
+def test_n_plus_one_in_child_form_field(project):
+    with pytest.raises(forms.QueryBudgetExceeded) as error:
+        with forms.query_budget(LookupProjectForm):
+            LookupProjectForm(instance=project)
+
+    # five rows and the hidden template row
+    assert 'N+1 in fetch of jobs.tag: 6 times' in str(error.value)
+
+
+def test_log_instead_of_raise(project, caplog):
+    with forms.query_budget(LookupProjectForm, raise_error=False, fetch=1):
+        LookupProjectForm(instance=project)
+
+    assert 'jobs.tag' in caplog.text
+
+
+def test_queries_of_other_forms_are_not_counted(project):
+    with forms.query_budget(ProjectForm, fetch=0):
+        LookupJobForm(instance=Job(name='Job'))
@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project  # noqa: E402
+
+
+class ProfileForm(forms.Form):
+    title = forms.Field()
+
+
+class JobForm(forms.Form):
+    name = forms.Field()
+
+
+class ProjectForm(forms.Form):
+    name = forms.Field()
+    profile = forms.NestedFormField(form_class=ProfileForm)
+    tags = forms.ManyToManyCheckBoxListField()
+    jobs = forms.FormsetField(form_class=JobForm)
+
+
+def test_relation_is_resolved_once_per_model_field_class_and_attribute(monkeypatch):
+    calls = list()
+    get_field = Project._meta.get_field
+
+    def counting_get_field(name, *args, **kwargs):
+        calls.append(name)
+        return get_field(name, *args, **kwargs)
+
+    monkeypatch.setattr(Project._meta, 'get_field', counting_get_field)
+    forms.Relation.cache.clear()
+
+    data = {'name': 'Project', '-title': 'Profile', 'jobs-0-name': 'a', 'jobs-1-name': 'b', 'jobs-2-name': 'c'}
+
+    for i in range(3):
+        form = ProjectForm(instance=Project())
+        form.load(data)
+        form.save()
+
+    # django itself also looks up 'id' while saving
+    assert sorted(c for c in calls if c != 'id') == ['jobs', 'profile', 'tags']
+    assert Project.objects.get(pk=form.instance.pk).jobs.count() == 3
@@ -0,0 +1,21 @@
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms.benchmarks.cases import ProjectForm, ProjectTableForm, make_project  # noqa: E402
+
+
+def test_render_into_matches_render():
+    project = make_project(5)
+
+    for form_class in (ProjectForm, ProjectTableForm):
+        form = form_class(instance=project)
+        buffer = io.BytesIO()
+        form.render_into(buffer)
+
+        assert buffer.getvalue() == form.render().encode()
@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.utils.functional import lazy  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+
+
+email_label = ['Email']
+
+
+class ContactForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.TextField(label='Name', required=True)
+    email = forms.Field(label=lazy(lambda: email_label[0], str)())
+    phone = forms.Field()
+
+
+class RenamedContactForm(ContactForm):
+    def __init__(self, *args, **kwargs):
+        super(RenamedContactForm, self).__init__(*args, **kwargs)
+        self.fields['name']._label = 'Full name'
+
+
+def render_fields(form):
+    return ''.join(form.renderer.render_field(f) for _, f in form.fields.items())
+
+
+@pytest.mark.parametrize('renderer_class', [forms.BootstrapFormRenderer, forms.TableFormRenderer])
+@pytest.mark.parametrize('form_class', [ContactForm, RenamedContactForm])
+def test_plan_output_matches_render_field(renderer_class, form_class):
+    form = form_class(instance=DynamicObject(), renderer_class=renderer_class)
+
+    assert form.renderer.get_plan() is not None
+    assert form.renderer.render_form(form) == render_fields(form)
+
+
+def test_labels_are_not_frozen_in_plan():
+    ContactForm(instance=DynamicObject()).render()
+
+    form = RenamedContactForm(instance=DynamicObject())
+    assert 'Full name' in form.renderer.render_form(form)
+
+    form = ContactForm(instance=DynamicObject())
+    form.fields['phone']._label = 'Phone'
+    assert '>Phone</label>' in form.renderer.render_form(form)
+
+    # lazy label, e.g. translated one, is evaluated on every render
+    email_label[0] = 'E-mail'
+    assert '>E-mail</label>' in ContactForm(instance=DynamicObject()).render()
+
+
+
+class PublicContactForm(ContactForm):
+    def __init__(self, *args, public=False, **kwargs):
+        super(PublicContactForm, self).__init__(*args, **kwargs)
+
+        if public:
+            del self.fields['phone']
+
+
+@pytest.mark.parametrize('order', [(False, True, False), (True, False, True)])
+def test_plan_is_not_used_for_forms_with_dropped_fields(order):
+    # fresh class, plans are cached per form class
+    form_class = type('PublicContactForm', (PublicContactForm,), {})
+
+    for public in order:
+        form = form_class(instance=DynamicObject(), public=public)
+        buffer = io.BytesIO()
+        form.render_into(buffer)
+
+        assert form.render() == render_fields(form)
+        assert buffer.getvalue() == form.render().encode()
+        assert ('phone' in form.render()) is not public
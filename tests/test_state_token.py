@@ -0,0 +1,99 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.Field()
+
+
+class ProjectForm(forms.Form):
+    use_state_token = True
+
+    name = forms.Field()
+    jobs = forms.FormsetField(form_class=JobForm)
+
+
+@pytest.fixture
+def project():
+    project = Project.objects.create(name='Project')
+    Job.objects.bulk_create([Job(project=project, name='Job %d' % i) for i in range(3)])
+    yield Project.objects.get(pk=project.pk)
+    project.delete()
+
+
+def make_data(token, jobs):
+    data = {'name': 'Project', '__state__': token}
+
+    for i, (pk, name) in enumerate(jobs):
+        data['jobs-%d-id' % i] = str(pk)
+        data['jobs-%d-name' % i] = name
+
+    return data
+
+
+def bind(project, data):
+    with CaptureQueriesContext(connection) as context:
+        form = ProjectForm(instance=project, data=data)
+
+    return form, len(context.captured_queries)
+
+
+def test_token_is_rendered_and_restores_rows_without_queries(project):
+    form = ProjectForm(instance=project)
+    token = form.get_state_token()
+    pks = [f.instance.pk for f in form.fields['jobs'].forms.values()]
+
+    assert 'name="__state__" value="%s"' % token in form.render()
+
+    restored, queries = bind(project, make_data(token, []))
+
+    assert queries == 0
+    assert [f.instance.pk for f in restored.fields['jobs'].forms.values()] == pks
+    assert restored.fields['jobs'].forms['1'].fields['name'].value == 'Job 1'
+
+
+@pytest.mark.parametrize('spoil', [
+    lambda token, other: token[:10] + ('B' if token[10] == 'A' else 'A') + token[11:],
+    lambda token, other: other,
+    lambda token, other: 'not a token',
+])
+def test_tampered_or_foreign_token_falls_back_to_fetch(project, spoil):
+    other = Project.objects.create(name='Other')
+    other_token = ProjectForm(instance=other).get_state_token()
+    token = ProjectForm(instance=project).get_state_token()
+
+    form, queries = bind(project, make_data(spoil(token, other_token), []))
+
+    assert queries > 0
+    assert form.fields['jobs'].restored_pks is None
+    assert len(form.fields['jobs'].forms) == 3
+
+    other.delete()
+
+
+def test_rows_missing_from_submission_are_deleted(project):
+    jobs = list(project.jobs.order_by('pk'))
+    token = ProjectForm(instance=project).get_state_token()
+
+    data = make_data(token, [(jobs[0].pk, 'First'), (jobs[2].pk, 'Third')])
+    form, _ = bind(project, data)
+    form.load(data)
+
+    assert form.is_valid()
+    form.save()
+
+    assert list(project.jobs.order_by('pk').values_list('name', flat=True)) == ['First', 'Third']
@@ -0,0 +1,53 @@
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms.benchmarks.cases import ProjectHeaderTableForm, ProjectTableForm, make_post, make_project  # noqa: E402
+from forms.benchmarks.models import Project  # noqa: E402
+
+
+def test_labels_are_rendered_once_in_header():
+    html = ProjectHeaderTableForm(instance=make_project(5)).render()
+
+    assert html.count('<thead><tr><th>name</th><th>hours</th></tr></thead>') == 1
+    assert html.count('<th>') == 2
+    assert '<tbody class="container"><tr><input type="hidden"' in html
+    assert '<td><input type="text" required maxlength="100" name="jobs-0-name" value="' in html
+
+
+def test_header_table_is_smaller():
+    project = make_project(5)
+
+    compact = ProjectHeaderTableForm(instance=project).render()
+    full = ProjectTableForm(instance=project).render()
+
+    assert len(compact) < len(full)
+    assert 'form-control" id="jobs-' not in compact
+
+
+def test_errors_only_in_invalid_cells():
+    form = ProjectHeaderTableForm(instance=Project())
+    form.load(make_post(3, invalid_every=2))
+
+    for _, child in form.fields['jobs'].forms.items():
+        child.is_valid()
+
+    html = form.render()
+
+    # rows 0 and 2 have invalid name and hours
+    assert html.count('class="form-error"') == 4
+    assert '<td><input type="text" required maxlength="100" name="jobs-1-name" value="Job 1"/></td>' in html
+
+
+def test_render_into_matches_render():
+    form = ProjectHeaderTableForm(instance=make_project(5))
+    buffer = io.BytesIO()
+    form.render_into(buffer)
+
+    assert buffer.getvalue() == form.render().encode()
+    assert "$('#jobs > table > .container')" in form.js
@@ -0,0 +1,84 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.template import loader  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+
+TEMPLATES = [{
+    'NAME': 'tests',
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'loaders': [('django.template.loaders.locmem.Loader', {
+            'row.html': '<p>{{ label }}{{ control }}{{ errors }}</p>',
+        })],
+    },
+}]
+
+
+class Renderer(forms.TemplateFormRenderer):
+    template_engine = 'tests'
+    control_class = 'input'
+
+
+class ContactForm(forms.Form):
+    name = forms.Field()
+    email = forms.Field()
+    phone = forms.Field()
+
+    def __init__(self, *args, **kwargs):
+        super(ContactForm, self).__init__(*args, renderer_class=Renderer, **kwargs)
+        self.fields['name'].template = 'row.html'
+        self.fields['email'].template = 'missing.html'
+
+
+@pytest.fixture(autouse=True)
+def templates():
+    Renderer._templates.clear()
+
+    with override_settings(TEMPLATES=TEMPLATES):
+        yield
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    names = list()
+    get_template = loader.get_template
+
+    def counted(name, using=None):
+        names.append(name)
+        return get_template(name, using=using)
+
+    monkeypatch.setattr(loader, 'get_template', counted)
+    return names
+
+
+def test_field_template_gets_control_attributes_of_renderer():
+    form = ContactForm(instance=DynamicObject())
+
+    assert form.fields['name'].render() == \
+        '<p><label class="form-label">name</label><input type="text" class="input" id="name" name="name" value=""/></p>'
+
+
+def test_templates_are_looked_up_once(lookups):
+    for _ in range(3):
+        ContactForm(instance=DynamicObject()).render()
+
+    assert sorted(lookups) == ['forms/form.html', 'missing.html', 'row.html']
+
+
+def test_missing_template_falls_back_to_bootstrap_markup(lookups):
+    form = ContactForm(instance=DynamicObject())
+    field = form.fields['email']
+
+    assert field.render() == forms.BootstrapFormRenderer.render_field(form.renderer, field)
+    assert lookups == ['missing.html']
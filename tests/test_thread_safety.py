@@ -0,0 +1,53 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from forms import forms  # noqa: E402
+from forms.html import HtmlHelper  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+from forms.benchmarks.cases import FlatForm, ProjectTableForm, make_project  # noqa: E402
+
+
+class UploadForm(forms.Form):
+    kind = forms.SelectField(options=[(1, 'One'), (2, 'Two')], attributes={'data-kind': 'x'})
+    attachment = forms.FileField(attributes={'accept': 'image/*'})
+
+
+def test_helpers_do_not_mutate_attributes():
+    attributes = {'class': 'form-control'}
+
+    HtmlHelper.input('name', 'value', attributes)
+    HtmlHelper.select('name', 1, [(1, 'One')], attributes)
+    HtmlHelper.link('label', '/', attributes)
+    HtmlHelper.img('/a.png', 'a', attributes)
+
+    assert attributes == {'class': 'form-control'}
+
+    form = UploadForm(instance=DynamicObject())
+    form.render()
+
+    assert form.fields['kind'].attributes == {'data-kind': 'x'}
+    assert form.fields['attachment'].attributes == {'accept': 'image/*'}
+
+
+def test_parallel_rendering_is_identical():
+    shared = ProjectTableForm(instance=make_project(20))
+    flat = FlatForm(instance=DynamicObject())
+    expected = shared.render() + flat.render()
+
+    # first renders of all threads race on empty class-level caches
+    forms.BootstrapFormRenderer._plans.clear()
+    forms.BootstrapFormRenderer._encoded_plans.clear()
+
+    def render(_):
+        return [shared.render() + flat.render() for _ in range(5)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = [out for outs in executor.map(render, range(32)) for out in outs]
+
+    assert all(out == expected for out in results)
@@ -0,0 +1,110 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms.benchmarks.env import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from forms import forms  # noqa: E402
+from forms.benchmarks.models import Project, Job  # noqa: E402
+
+calls = list()
+
+
+class ProfileForm(forms.Form):
+    title = forms.Field()
+
+
+class JobForm(forms.Form):
+    id = forms.HiddenIdField()
+    name = forms.Field()
+    hours = forms.IntegerField()
+
+    def before_save(self):
+        calls.append(('before_save', self.instance.pk))
+
+    def after_save(self):
+        calls.append(('after_save', self.instance.pk is not None))
+
+
+class ProjectForm(forms.Form):
+    batch_save = True
+
+    name = forms.Field()
+    profile = forms.NestedFormField(form_class=ProfileForm)
+    jobs = forms.FormsetField(form_class=JobForm)
+
+    def after_apply(self):
+        calls.append(('after_apply', self.instance.name))
+
+
+def make_data(jobs):
+    data = {'name': 'Project', '-title': 'Profile'}
+
+    for i, (pk, name) in enumerate(jobs):
+        data['jobs-%d-id' % i] = str(pk or '')
+        data['jobs-%d-name' % i] = name
+        data['jobs-%d-hours' % i] = str(i)
+
+    return data
+
+
+def inserts(context, table):
+    return [q for q in context.captured_queries if q['sql'].startswith('INSERT INTO "%s"' % table)]
+
+
+def test_new_tree_is_inserted_by_one_statement_per_model():
+    calls.clear()
+    form = ProjectForm(instance=Project())
+    form.load(make_data([(None, 'Job %d' % i) for i in range(5)]))
+
+    with CaptureQueriesContext(connection) as context:
+        form.save()
+
+    project = form.instance
+
+    assert project.profile.title == 'Profile'
+    assert sorted(project.jobs.values_list('name', 'hours')) == [('Job %d' % i, i) for i in range(5)]
+    assert len(inserts(context, 'benchmarks_job')) == 1
+    assert len(inserts(context, 'benchmarks_profile')) == 1
+
+    assert calls[0] == ('after_apply', 'Project')
+    assert calls.count(('after_save', True)) == 5
+    assert calls.count(('before_save', None)) == 5
+
+
+def test_changed_rows_are_updated_and_missing_rows_deleted():
+    project = Project.objects.create(name='Project')
+    jobs = Job.objects.bulk_create([Job(project=project, name='Job %d' % i, hours=i) for i in range(4)])
+
+    form = ProjectForm(instance=Project.objects.get(pk=project.pk))
+    form.load(make_data([(jobs[0].pk, 'First'), (jobs[1].pk, 'Second'), (jobs[2].pk, 'Job 2')]))
+
+    with CaptureQueriesContext(connection) as context:
+        form.save()
+
+    updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE')]
+
+    # only names changed, unchanged row and project are not written
+    assert len(updates) == 1
+    assert updates[0].startswith('UPDATE "benchmarks_job" SET "name"') and '"hours"' not in updates[0]
+
+    assert sorted(project.jobs.values_list('name', 'hours')) == [('First', 0), ('Job 2', 2), ('Second', 1)]
+    assert not Job.objects.filter(pk=jobs[3].pk).exists()
+
+
+def test_form_after_save_is_called_without_batch_save():
+    calls.clear()
+
+    class UnbatchedProjectForm(ProjectForm):
+        batch_save = False
+
+    form = UnbatchedProjectForm(instance=Project())
+    form.load(make_data([(None, 'Job')]))
+    form.save()
+
+    assert calls.count(('after_save', True)) == 1
@@ -0,0 +1,102 @@
+import io
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from forms import forms
+from forms.uploads import MaxSizeStage, ChecksumStage, ContentTypeStage
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 1000
+
+
+class MemoryUploadedFile(io.BytesIO):
+    """ In-memory stand-in for django UploadedFile without chunks() """
+
+    def __init__(self, content, name='file.bin'):
+        super().__init__(content)
+        self.name = name
+
+
+class TempUploadedFile(object):
+    """ Temp-file stand-in for django TemporaryUploadedFile """
+
+    def __init__(self, content, name='file.bin'):
+        self.name = name
+        self.file = tempfile.TemporaryFile()
+        self.file.write(content)
+        self.size = len(content)
+        self.chunk_calls = 0
+
+    def seek(self, pos):
+        self.file.seek(pos)
+
+    def chunks(self, chunk_size):
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(chunk_size)
+            if not chunk:
+                break
+            self.chunk_calls += 1
+            yield chunk
+
+
+class Document(object):
+    def __init__(self):
+        self.attachment = None
+
+    def save(self):
+        pass
+
+
+class DocumentForm(forms.Form):
+    attachment = forms.FileField(stages=[
+        MaxSizeStage(2048),
+        ChecksumStage('md5'),
+        ContentTypeStage(allowed=['image/png']),
+    ], chunk_size=256)
+
+
+def make_form(upload):
+    form = DocumentForm(instance=Document())
+    form.load({}, {'attachment': upload})
+    return form
+
+
+def test_valid_upload_from_memory():
+    form = make_form(MemoryUploadedFile(PNG))
+
+    assert form.is_valid()
+    info = form.fields['attachment'].upload_info
+    assert info['size'] == len(PNG)
+    assert info['content_type'] == 'image/png'
+    assert len(info['checksum']) == 32
+
+
+def test_valid_upload_from_temp_file_is_read_by_chunks():
+    upload = TempUploadedFile(PNG)
+    form = make_form(upload)
+
+    assert form.is_valid()
+    assert upload.chunk_calls == 4
+
+    form.save()
+    assert form.instance.attachment is upload
+
+
+def test_oversize_aborts_before_reading():
+    upload = TempUploadedFile(PNG * 3)
+    form = make_form(upload)
+
+    assert not form.is_valid()
+    assert upload.chunk_calls == 0
+    assert form.errors['attachment'] == ['Size of attachment must not exceed 2048 bytes']
+
+
+def test_wrong_type_aborts_on_first_chunk():
+    upload = TempUploadedFile(b'%PDF-' + b'\x00' * 1500)
+    form = make_form(upload)
+
+    assert not form.is_valid()
+    assert upload.chunk_calls == 1
+    assert form.errors['attachment'] == ['Type of file attachment is not allowed']
@@ -0,0 +1,127 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from forms import forms  # noqa: E402
+from forms.model import DynamicObject  # noqa: E402
+from forms.validators import RequiredValidator, MaxLengthValidator, run_validators  # noqa: E402
+
+
+class NameForm(forms.Form):
+    error_required_message = 'Please fill %s'
+
+    name = forms.TextField(required=True, min_length=2, max_length=5)
+    age = forms.IntegerField()
+
+
+class StrictNameForm(NameForm):
+    def __init__(self, *args, **kwargs):
+        super(StrictNameForm, self).__init__(*args, **kwargs)
+        self.fields['age'].required = True
+        self.fields['name'].max_length = 3
+
+
+def make_form(form_class, data):
+    form = form_class(instance=DynamicObject())
+    form.load(data)
+    return form
+
+
+def test_validator_returns_code_instead_of_raising():
+    assert RequiredValidator()('') == 'required'
+    assert RequiredValidator()('value') is None
+    assert run_validators((RequiredValidator(), MaxLengthValidator(2)), 'long').code == 'max_length'
+
+
+def test_messages_are_formatted_once_with_form_override():
+    form = make_form(NameForm, {'name': '', 'age': '1'})
+    validator = NameForm.get_validator_chains()['name'][0][0]
+
+    message = validator.format_message(form.fields['name'])
+
+    assert message == 'Please fill name'
+    assert validator.format_message(form.fields['name']) is message
+
+
+def test_messages_follow_instance_and_lazy_templates():
+    from django.utils.functional import lazy
+
+    template = ['Fill %s']
+    validator = RequiredValidator()
+
+    form = make_form(NameForm, {})
+    form.error_required_message = lazy(lambda: template[0], str)()
+    assert validator.format_message(form.fields['name']) == 'Fill name'
+
+    template[0] = 'Bitte %s ausfüllen'
+    assert validator.format_message(form.fields['name']) == 'Bitte name ausfüllen'
+
+    form.error_required_message = 'Enter %s'
+    assert validator.format_message(form.fields['name']) == 'Enter name'
+    assert validator.format_message(make_form(NameForm, {}).fields['name']) == 'Please fill name'
+
+
+def test_text_length_limits():
+    assert make_form(NameForm, {'name': 'abcde', 'age': '1'}).is_valid()
+    assert not make_form(NameForm, {'name': 'abcdef', 'age': '1'}).is_valid()
+
+    form = make_form(NameForm, {'name': 'a', 'age': '1'})
+    assert not form.is_valid()
+    assert form.errors['name'] == ['Minimum length of name is 2']
+
+    # missing value is reported by required check, not by len()
+    form = make_form(NameForm, {'age': '1'})
+    assert not form.is_valid()
+    assert form.errors['name'] == ['Please fill name']
+
+
+def test_length_of_value_without_length_is_error():
+    form = NameForm(instance=DynamicObject())
+    form.load_json({'name': 12345678, 'age': 1})
+
+    assert not form.is_valid()
+    assert form.errors['name'] == ['Minimum length of name is 2']
+    assert MaxLengthValidator(5)(12345678) == 'max_length'
+
+
+def test_fail_fast_stops_at_first_invalid_field():
+    form = make_form(NameForm, {'name': '', 'age': 'many'})
+    assert not form.is_valid(fail_fast=True)
+    assert list(form.errors) == ['name']
+
+    form = make_form(NameForm, {'name': '', 'age': 'many'})
+    assert not form.is_valid()
+    assert list(form.errors) == ['name', 'age']
+
+
+def test_bound_field_config_overrides_class_chain():
+    form = make_form(StrictNameForm, {'name': 'abcd', 'age': ''})
+
+    assert not form.is_valid()
+    assert form.errors['age'] == ['Please fill age']
+    assert form.errors['name'] == ['Maximum length of name is 3']
+    assert 'maxlength="3"' in form.fields['name'].render_control()
+
+    # declared fields still share chain of class
+    assert make_form(NameForm, {'name': 'abcd', 'age': '1'}).is_valid()
+
+
+class ExtendedNameForm(NameForm):
+    def __init__(self, *args, **kwargs):
+        super(ExtendedNameForm, self).__init__(*args, **kwargs)
+
+        nickname = forms.TextField(required=True, max_length=3)
+        nickname.form = self
+        nickname.attribute = 'nickname'
+        nickname.instance = self.instance
+        nickname.prefix = self.prefix
+        self.fields['nickname'] = nickname
+
+
+def test_field_added_to_instance_is_validated_with_own_chain():
+    form = make_form(ExtendedNameForm, {'name': 'abc', 'age': '1', 'nickname': 'long'})
+
+    assert not form.is_valid()
+    assert form.errors == {'nickname': ['Maximum length of nickname is 3']}
+    assert '"nickname":[{"rule":"required"' in form.js
@@ -0,0 +1,271 @@
+"""
+Unit of work of form tree save. Pending inserts, updates and deletes of all forms of the tree
+are collected first, ordered by foreign key dependency (host before rows of its formsets and
+reverse nested forms, forward nested form before host) and written by one bulk statement per
+model and dependency level instead of save() per instance. Saved rows are updated only when
+their columns changed, one statement per set of changed columns:
+
+    class ProjectForm(forms.Form):
+        batch_save = True
+
+before_save and after_apply hooks of fields and forms are called while the tree is collected,
+after_save hooks when the whole tree is written, after_commit when transaction is committed.
+Model.save() overrides and pre_save / post_save signals are not called for batched instances
+"""
+import copy
+import functools
+
+from .forms import Field, Form, NestedFormField, FormsetField
+from .guard import scope
+
+
+class SaveNode(object):
+    """ Instance to write, forms bound to it and nodes which must be written before """
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.forms = list()
+        self.after = list()
+
+        # point foreign keys of instance to instances written before, called right before write
+        self.links = list()
+
+        self.level = None
+
+        # loaded column values of saved instance, only changed columns are updated
+        self.loaded = self.get_values(instance)
+
+    @staticmethod
+    def get_values(instance):
+        meta = getattr(instance, '_meta', None)
+
+        if meta is None or instance.pk is None or instance._state.adding:
+            return None
+
+        values = vars(instance)
+
+        # mutable values may be changed in place by hooks
+        return {f.attname: copy.deepcopy(values[f.attname]) if isinstance(values[f.attname], (dict, list))
+                else values[f.attname] for f in meta.concrete_fields if f.attname in values and not f.primary_key}
+
+    def get_changed_fields(self):
+        values = vars(self.instance)
+        return [name for name, value in self.loaded.items() if values.get(name) != value]
+
+
+class UnitOfWork(object):
+
+    def __init__(self, form):
+        self.form = form
+
+        # id of instance -> node, forms sharing instance through identity map share node
+        self.nodes = dict()
+
+        # collected forms in tree order, their after_save hooks are called in this order
+        self.forms = list()
+
+        # model -> primary keys of formset rows missing in submission
+        self.deletes = dict()
+
+    @staticmethod
+    def is_planned(field):
+        """ Relational field saved by unit of work, subclasses with own after_save save children themselves """
+        after_save = type(field).after_save
+        return after_save is NestedFormField.after_save or after_save is FormsetField.after_save
+
+    def get_node(self, instance):
+        try:
+            return self.nodes[id(instance)]
+        except KeyError:
+            return self.nodes.setdefault(id(instance), SaveNode(instance))
+
+    @staticmethod
+    def depend(node, prerequisite, link):
+        if node is not prerequisite:
+            node.after.append(prerequisite)
+
+        node.links.append(link)
+
+    def collect(self, form):
+        # values are taken before hooks and apply() change instance
+        node = self.get_node(form.instance)
+
+        with scope('save', form):
+            # relational fields saved by unit of work would save children in before_save
+            for _, f in form.fields.items():
+                if not self.is_planned(f):
+                    with scope('save', form, f):
+                        f.before_save()
+
+            form.before_save()
+
+            for _, f in form.fields.items():
+                f.apply()
+
+            form.after_apply()
+
+        node.forms.append(form)
+        self.forms.append(form)
+
+        for _, f in form.fields.items():
+            if not self.is_planned(f):
+                continue
+
+            with scope('save', form, f):
+                if isinstance(f, FormsetField):
+                    self.collect_formset(node, f)
+                else:
+                    self.collect_nested(node, f)
+
+        return node
+
+    def collect_nested(self, node, field):
+        nested_form = field.nested_form
+
+        if not field.is_forward():
+            # reverse relation, nested instance points to host
+            link = functools.partial(field.set_relative_fields, nested_form.instance)
+            link()
+
+            self.depend(self.collect(nested_form), node, link)
+            return
+
+        # forward relation, host instance points to nested one
+        child = self.collect(nested_form)
+        self.depend(node, child, functools.partial(field.set_relative_fields, nested_form.instance))
+
+    def collect_formset(self, node, field):
+        added = list()
+
+        for _, form in field.forms.items():
+            link = functools.partial(field.set_relative_fields, form.instance)
+            link()
+
+            self.depend(self.collect(form), node, link)
+            added.append(form.instance)
+
+        removed = field.get_removed_pks(added)
+
+        if len(removed) > 0:
+            self.deletes.setdefault(field.relation.related_model, list()).extend(removed)
+
+    def get_level(self, node):
+        """ Length of longest dependency chain before node, form tree has no cycles """
+        if node.level is None:
+            node.level = max([self.get_level(n) + 1 for n in node.after], default=0)
+
+        return node.level
+
+    def get_batches(self):
+        """ Lists of nodes of one model in order of levels """
+        levels = dict()
+
+        for _, node in self.nodes.items():
+            models = levels.setdefault(self.get_level(node), dict())
+            models.setdefault(node.instance.__class__, list()).append(node)
+
+        return [(model, nodes) for level in sorted(levels) for model, nodes in levels[level].items()]
+
+    def run(self):
+        form = self.form
+
+        with scope('save', form):
+            self.collect(form)
+
+            for model, nodes in self.get_batches():
+                self.write(model, nodes)
+
+            for model, pks in self.deletes.items():
+                self.delete(model, pks)
+
+        for collected in self.forms:
+            with scope('save', collected):
+                for _, f in collected.fields.items():
+                    if type(f).after_save is not Field.after_save and not self.is_planned(f):
+                        with scope('save', collected, f):
+                            f.after_save()
+
+                collected.after_save()
+
+            if type(collected).after_commit is not Form.after_commit:
+                collected.on_commit(collected.after_commit)
+
+        return True
+
+    def write(self, model, nodes):
+        for node in nodes:
+            for link in node.links:
+                link()
+
+        instances = [node.instance for node in nodes]
+
+        if not hasattr(model, '_meta'):
+            for instance in instances:
+                instance.save()
+            return
+
+        from django.db import connections, router
+
+        using = router.db_for_write(model)
+        manager = model._default_manager.db_manager(using)
+
+        # multi-table inheritance is written by save() of every instance
+        bulk = not model._meta.parents
+
+        inserts = [i for i in instances if i.pk is None]
+        updates = [n for n in nodes if n.instance.pk is not None and not n.instance._state.adding]
+        saves = [i for i in instances if i.pk is not None and i._state.adding]
+
+        if len(inserts) > 0:
+            # children of inserted rows need primary keys returned by insert
+            if bulk and connections[using].features.can_return_rows_from_bulk_insert:
+                manager.bulk_create(inserts)
+            else:
+                saves.extend(inserts)
+
+        if len(updates) > 0:
+            if bulk:
+                self.update(manager, model, updates)
+            else:
+                saves.extend(n.instance for n in updates)
+
+        # instances with preset primary key which may exist are saved by update or insert
+        for instance in saves:
+            instance.save(using=using)
+
+    @staticmethod
+    def update(manager, model, nodes):
+        """
+        bulk_update of columns changed since instances were collected, one statement per set
+        of changed columns. Unchanged rows are not written
+        """
+        fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+        groups = dict()
+
+        for node in nodes:
+            changed = set(node.get_changed_fields())
+
+            if len(changed) == 0:
+                continue
+
+            instance = node.instance
+
+            # same values as save(), e.g. auto_now dates and committed files
+            for f in fields:
+                if f.attname in node.loaded:
+                    value = f.pre_save(instance, False)
+
+                    if f.attname in changed or value != node.loaded[f.attname]:
+                        changed.add(f.attname)
+                        setattr(instance, f.attname, value)
+
+            groups.setdefault(frozenset(changed), list()).append(instance)
+
+        for changed, group in groups.items():
+            manager.bulk_update(group, [f.name for f in fields if f.attname in changed])
+
+    @staticmethod
+    def delete(model, pks):
+        from django.db import router
+
+        model._default_manager.db_manager(router.db_for_write(model)).filter(pk__in=pks).delete()
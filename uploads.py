@@ -0,0 +1,154 @@
+import hashlib
+
+from .forms import ValidationError
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'%PDF-', 'application/pdf'),
+    (b'PK\x03\x04', 'application/zip'),
+]
+
+
+def iter_chunks(upload, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Read uploaded file by fixed size chunks without loading it whole """
+    if hasattr(upload, 'seek'):
+        upload.seek(0)
+
+    if hasattr(upload, 'chunks'):
+        yield from upload.chunks(chunk_size)
+        return
+
+    while True:
+        chunk = upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class UploadStage(object):
+    """
+    Base pipeline stage. Stage receives every chunk of the file and raises
+    ValidationError to abort reading
+    """
+
+    error_message = 'File %s is invalid'
+
+    def start(self, field, upload):
+        self.field = field
+
+    def process(self, chunk):
+        pass
+
+    def finish(self):
+        pass
+
+    def fail(self, *args):
+        raise ValidationError(self.error_message % ((self.field.label,) + args))
+
+
+class MaxSizeStage(UploadStage):
+    error_message = 'Size of %s must not exceed %d bytes'
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+
+    def start(self, field, upload):
+        super().start(field, upload)
+        self.size = 0
+
+        # reject before reading when size is known in advance
+        size = getattr(upload, 'size', None)
+        if size is not None and size > self.max_size:
+            self.fail(self.max_size)
+
+    def process(self, chunk):
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            self.fail(self.max_size)
+
+    def finish(self):
+        self.field.upload_info['size'] = self.size
+
+
+class ChecksumStage(UploadStage):
+    def __init__(self, algorithm='sha256'):
+        self.algorithm = algorithm
+        self.hash = None
+
+    def start(self, field, upload):
+        super().start(field, upload)
+        self.hash = hashlib.new(self.algorithm)
+
+    def process(self, chunk):
+        self.hash.update(chunk)
+
+    def finish(self):
+        self.field.upload_info['checksum'] = self.hash.hexdigest()
+
+
+class ContentTypeStage(UploadStage):
+    """ Sniff content type from leading bytes of the file """
+
+    error_message = 'Type of file %s is not allowed'
+
+    def __init__(self, allowed=None, signatures=None):
+        self.allowed = allowed
+        self.signatures = signatures or SIGNATURES
+        self.head = b''
+        self.content_type = None
+
+    def start(self, field, upload):
+        super().start(field, upload)
+        self.head = b''
+        self.content_type = None
+
+    def sniff(self):
+        for signature, content_type in self.signatures:
+            if self.head.startswith(signature):
+                return content_type
+
+        return 'application/octet-stream'
+
+    def process(self, chunk):
+        if self.content_type is not None:
+            return
+
+        self.head += chunk
+
+        if len(self.head) < max(len(s) for s, _ in self.signatures):
+            return
+
+        self.check()
+
+    def check(self):
+        self.content_type = self.sniff()
+
+        if self.allowed is not None and self.content_type not in self.allowed:
+            self.fail()
+
+    def finish(self):
+        if self.content_type is None:
+            self.check()
+
+        self.field.upload_info['content_type'] = self.content_type
+
+
+def run_pipeline(field, upload, stages, chunk_size=DEFAULT_CHUNK_SIZE):
+    for stage in stages:
+        stage.start(field, upload)
+
+    for chunk in iter_chunks(upload, chunk_size):
+        for stage in stages:
+            stage.process(chunk)
+
+    for stage in stages:
+        stage.finish()
+
+    if hasattr(upload, 'seek'):
+        upload.seek(0)
@@ -0,0 +1,284 @@
+import re
+from datetime import date
+from decimal import Decimal
+
+# same patterns as client rules, see CLIENT_VALIDATION_JS in forms.py
+INTEGER_RE = re.compile(r'^\s*[-+]?[0-9]+\s*$', re.ASCII)
+DECIMAL_RE = re.compile(r'^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)\s*$', re.ASCII)
+
+
+def parse_integer(value):
+    """ int of integral number or digits string, raises ValueError or TypeError like int() """
+    if isinstance(value, bool):
+        raise TypeError(value)
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, (float, Decimal)):
+        if value != value or value in (float('inf'), float('-inf')) or value != int(value):
+            raise ValueError(value)
+
+        return int(value)
+
+    if not isinstance(value, str):
+        raise TypeError(value)
+
+    if INTEGER_RE.match(value) is None:
+        raise ValueError(value)
+
+    return int(value)
+
+
+def parse_decimal(value):
+    """ Finite Decimal of number or decimal string without exponent, raises ValueError or TypeError """
+    if isinstance(value, bool):
+        raise TypeError(value)
+
+    if isinstance(value, (int, float, Decimal)):
+        value = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+
+        if not value.is_finite():
+            raise ValueError(value)
+
+        return value
+
+    if not isinstance(value, str):
+        raise TypeError(value)
+
+    if DECIMAL_RE.match(value) is None:
+        raise ValueError(value)
+
+    return Decimal(value.strip())
+
+
+class Validator(object):
+    """
+    Base check of field value. Returns error code instead of raising,
+    message is formatted only when error happens and cached afterwards
+    """
+
+    code = 'invalid'
+    message = 'Value of %s is invalid'
+
+    # name of form attribute that overrides message, e.g. error_required_message
+    form_message_attribute = None
+
+    # name of rule checked by browser too, None for server-only checks
+    rule = None
+
+    def __init__(self, message=None, code=None):
+        if message is not None:
+            self.message = message
+
+        if code is not None:
+            self.code = code
+
+        self._messages = dict()
+
+    def __call__(self, value):
+        return None
+
+    def get_message_template(self, form):
+        if self.form_message_attribute and form is not None:
+            return getattr(form, self.form_message_attribute, self.message)
+
+        return self.message
+
+    def message_params(self, field):
+        return field.label,
+
+    def html_attributes(self):
+        """ HTML constraint attributes of control, e.g. required or maxlength """
+        return dict()
+
+    def client_params(self):
+        return dict()
+
+    def client_rule(self, field):
+        """ Rule description for client side validation, same message as on server """
+        if self.rule is None:
+            return None
+
+        rule = {'rule': self.rule, 'message': self.format_message(field)}
+        rule.update(self.client_params())
+        return rule
+
+    def format_message(self, field):
+        template = self.get_message_template(field.form)
+        label = field.label
+
+        # lazy (translated) template or label may give other text on next call
+        if type(template) is not str or type(label) is not str:
+            return template % self.message_params(field)
+
+        key = (template, label)
+
+        try:
+            return self._messages[key]
+        except KeyError:
+            return self._messages.setdefault(key, template % self.message_params(field))
+
+
+def is_empty(value):
+    return value is None or value == ''
+
+
+class RequiredValidator(Validator):
+    code = 'required'
+    message = 'Field %s is required'
+    form_message_attribute = 'error_required_message'
+    rule = 'required'
+
+    def __call__(self, value):
+        if is_empty(value):
+            return self.code
+
+    def html_attributes(self):
+        return {'required': True}
+
+
+class IntegerValidator(Validator):
+    code = 'integer'
+    message = 'Value of %s must be numerical'
+    form_message_attribute = 'error_integer_message'
+    rule = 'integer'
+
+    def html_attributes(self):
+        return {'inputmode': 'numeric'}
+
+    def __call__(self, value):
+        if value is None:
+            return None
+
+        try:
+            parse_integer(value)
+        except (TypeError, ValueError):
+            return self.code
+
+
+class DecimalValidator(Validator):
+    code = 'decimal'
+    message = 'Value of %s must be a number'
+    form_message_attribute = 'error_decimal_message'
+    rule = 'decimal'
+
+    def html_attributes(self):
+        return {'inputmode': 'decimal'}
+
+    def __call__(self, value):
+        if value is None:
+            return None
+
+        try:
+            parse_decimal(value)
+        except (TypeError, ValueError):
+            return self.code
+
+
+class DateValidator(Validator):
+    code = 'date'
+    message = 'Value of %s must be a date'
+    form_message_attribute = 'error_date_message'
+
+    def __call__(self, value):
+        if value is None or isinstance(value, date):
+            return None
+
+        try:
+            date.fromisoformat(value.strip())
+        except (AttributeError, ValueError):
+            return self.code
+
+
+class MinLengthValidator(Validator):
+    code = 'min_length'
+    message = 'Minimum length of %s is %d'
+    rule = 'min_length'
+
+    def __init__(self, min_length, *args, **kwargs):
+        super(MinLengthValidator, self).__init__(*args, **kwargs)
+        self.min_length = min_length
+
+    def __call__(self, value):
+        if value is None:
+            return None
+
+        # e.g. number loaded from json has no length
+        if not isinstance(value, (str, list, tuple)) or len(value) < self.min_length:
+            return self.code
+
+    def message_params(self, field):
+        return field.label, self.min_length
+
+    def html_attributes(self):
+        return {'minlength': self.min_length}
+
+    def client_params(self):
+        return {'value': self.min_length}
+
+
+class MaxLengthValidator(Validator):
+    code = 'max_length'
+    message = 'Maximum length of %s is %d'
+    rule = 'max_length'
+
+    def __init__(self, max_length, *args, **kwargs):
+        super(MaxLengthValidator, self).__init__(*args, **kwargs)
+        self.max_length = max_length
+
+    def __call__(self, value):
+        if value is None:
+            return None
+
+        # e.g. number loaded from json has no length
+        if not isinstance(value, (str, list, tuple)) or len(value) > self.max_length:
+            return self.code
+
+    def message_params(self, field):
+        return field.label, self.max_length
+
+    def html_attributes(self):
+        return {'maxlength': self.max_length}
+
+    def client_params(self):
+        return {'value': self.max_length}
+
+
+class CallableValidator(Validator):
+    """ Wraps function that returns True for valid value """
+
+    def __init__(self, func, *args, **kwargs):
+        super(CallableValidator, self).__init__(*args, **kwargs)
+        self.func = func
+
+    def __call__(self, value):
+        if not self.func(value):
+            return self.code
+
+
+def config_key(value):
+    """ Comparable form of validator configuration, deep copies of field compare equal """
+    if isinstance(value, (list, tuple)):
+        return tuple(config_key(v) for v in value)
+
+    if isinstance(value, Validator):
+        return type(value), tuple(sorted((k, config_key(v)) for k, v in vars(value).items() if k != '_messages'))
+
+    return value
+
+
+def make_validator(validator):
+    if isinstance(validator, Validator):
+        return validator
+
+    return CallableValidator(validator)
+
+
+def run_validators(chain, value):
+    """ Run compiled chain and return first failed validator or None """
+    for validator in chain:
+        if validator(value) is not None:
+            return validator
+
+    return None